@@ -0,0 +1,159 @@
+# Benchmarks of the analysis pipeline of dash_visualization.py on logs written by dash_log_generator.py
+# Run it from the ns-3 directory like the dashboard itself:
+# `python dash_benchmark.py --clients 10 100 500 --output results.json`
+# `python dash_benchmark.py --clients 100 --compare old.json` prints how much slower or faster every stage got
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import dash_visualization as dv
+import dash_log_generator as generator
+
+benchmarkName = "benchmark"
+#clients of the selected.* stages
+selectedClients = 5
+
+#returns the commit of the checkout the benchmark runs in, results of different versions are told apart by it
+def get_version():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def timed(stages, name, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    stages[name] = time.perf_counter() - start
+    return result
+
+#the run is indexed so the replication aggregations find it, the dashboard's paths are pointed at the temporary directory
+def prepare_run(root, clients, args):
+    dv.path = root + "/"
+    dv.indexFile = dv.path + "summary_index.sqlite"
+    runPath = dv.path + benchmarkName + "/" + str(clients)
+    generator.generate(runPath, 0, clients, args.duration, args.packetRate, args.rate, args.changes, args.logFormat, args.binInterval, seed=args.seed)
+    dv.scan_runs()
+    dv.index_run(benchmarkName, str(clients), "sim0")
+    return runPath
+
+#time every stage of loading and showing a simulation, the sidecar cache is removed first
+#dv.prefetch is not called, so the stages of all clients are not shortened by background loads
+def time_stages(runPath, clients, workers):
+    stages = {}
+    dv.ingestWorkers = workers
+    dv.bind_simulation((benchmarkName, str(clients), "sim0"))
+    shutil.rmtree(runPath + "/" + dv.cacheDir, ignore_errors=True)
+    timed(stages, "load_data", dv.load_data, runPath, "sim0")
+    timed(stages, "load_data_cached", dv.load_data, runPath, "sim0")
+    #the first graph of a few selected clients, their logs are parsed on demand
+    selected = sorted(dv.client_data, key=dv.cmp_to_key(dv.cmp_clients))[:selectedClients]
+    timed(stages, "selected.tp", dv.build_time_figure, selected, "tp", "all")
+    for unit in dv.extract_unit:
+        if unit != "eff":
+            timed(stages, "load_unit." + unit, dv.load_unit, unit)
+    timed(stages, "get_efficiency", dv.get_efficiency)
+    outputs = list(dv.client_data)
+    timed(stages, "load_kpis", dv.load_kpis, outputs)
+    for graph, spec in dv.aggregated_units.items():
+        with dv.figureCacheLock:
+            dv.figureCache.clear()
+        timed(stages, "figure." + graph, dv.display_graph, outputs, spec["unit"], spec["aggregation"])
+    for unit in ["tp", "bl", "qualLevel"]:
+        timed(stages, "figure." + unit, dv.build_time_figure, outputs, unit, "all")
+    return stages
+
+#append the logs of a run to a live directory in chunks and time new_load_live_data after every chunk
+def time_live(runPath, root, chunks):
+    livePath = root + "/live"
+    os.makedirs(livePath)
+    files = [f for f in os.listdir(runPath) if dv.is_client_output(f, "sim0")]
+    logs = {f: open(runPath + "/" + f, "rb").read() for f in files}
+    for f in files:
+        open(livePath + "/" + f, "wb").close()
+    ticks = []
+    for chunk in range(chunks):
+        for f, data in logs.items():
+            with open(livePath + "/" + f, "ab") as log:
+                log.write(data[len(data) * chunk // chunks:len(data) * (chunk + 1) // chunks])
+        #give the watcher time to see the writes, this is not part of the tick
+        time.sleep(0.05)
+        start = time.perf_counter()
+        dv.new_load_live_data(livePath, "sim0")
+        ticks.append(time.perf_counter() - start)
+    return {"live.total": sum(ticks), "live.mean": sum(ticks) / len(ticks), "live.max": max(ticks)}
+
+def print_stages(result):
+    print("clients %d, %s with %d workers" % (result["clients"], result["mode"], result["workers"]))
+    for stage, seconds in result["stages"].items():
+        print("  %-28s %9.4f" % (stage, seconds))
+
+#print the ratio of every stage to the same stage in an older result file, above 1 is slower
+def compare(results, oldFile):
+    with open(oldFile) as f:
+        old = json.load(f)
+    oldResults = {(r["clients"], r["mode"]): r["stages"] for r in old["results"]}
+    print("compared to " + str(old.get("version")) + " from " + old.get("created", "?"))
+    for result in results:
+        oldStages = oldResults.get((result["clients"], result["mode"]))
+        if oldStages is None:
+            continue
+        print("clients %d, %s" % (result["clients"], result["mode"]))
+        for stage, seconds in result["stages"].items():
+            if oldStages.get(stage):
+                print("  %-28s %9.4f %9.4f  x%.2f" % (stage, oldStages[stage], seconds, seconds / oldStages[stage]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the stages of loading, aggregating and live reading synthetic simulations.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--duration", type=float, default=60, help="simulated seconds per client")
+    parser.add_argument("--packetRate", type=int, default=100, help="logged packets per second while a client downloads")
+    parser.add_argument("--rate", type=int, default=5000, help="bottleneck rate per client in Kbps")
+    parser.add_argument("--changes", type=generator.parse_change, nargs="*", default=[(20, 2000), (40, 8000)], help="bottleneck rate changes as seconds:Kbps")
+    parser.add_argument("--logFormat", choices=["text", "binary"], default="text")
+    parser.add_argument("--binInterval", type=int, default=0, help="throughput bin interval in microseconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--liveChunks", type=int, default=20, help="chunks the logs are appended in for the live benchmark")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = []
+    for clients in args.clients:
+        root = tempfile.mkdtemp(prefix="dash-benchmark-")
+        #the generator shares the bottleneck between all clients
+        scaledArgs = argparse.Namespace(**vars(args))
+        scaledArgs.rate = args.rate * clients
+        scaledArgs.changes = [(t, r * clients) for t, r in args.changes]
+        try:
+            runPath = prepare_run(root, clients, scaledArgs)
+            for mode, workers in (("serial", 1), ("parallel", args.workers)):
+                result = {"clients": clients, "mode": mode, "workers": workers, "stages": time_stages(runPath, clients, workers)}
+                if mode == "serial":
+                    result["stages"].update(time_live(runPath, root, args.liveChunks))
+                print_stages(result)
+                results.append(result)
+        finally:
+            shutil.rmtree(root)
+
+    report = {"version": get_version(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+              "pandas": pd.__version__, "numpy": np.__version__, "cpus": os.cpu_count(),
+              "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare")}, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+# Writes synthetic client logs and event logs in the formats of TcpStreamClient and DashEventScheduler
+# so the analysis can be tested and benchmarked without running ns-3:
+# `python dash_log_generator.py --name synthetic --clients 100 --duration 300 --changes 60:2000 120:8000`
+#
+# Every client follows the controller of TcpStreamClient: it requests a segment, downloads it with a share of the bottleneck,
+# plays back one segment every segment duration and waits while its buffer is full.
+# Rows are written in the order the simulator writes them, times are microseconds printed like ns-3 prints doubles.
+
+import argparse
+import heapq
+import os
+import random
+
+import numpy as np
+
+import dash_visualization as dv
+
+logHeader = "Time_Now;Segment_Index;Download_Request_Sent;Download_Start;Download_End;Segment_Size;Download_OK;Quality_Level;Rep_Level;Case;DelayCase;Buffer_Level;Bytes_Received;Buffer_Underrun"
+#bitrates of the representations in Kbps
+representationRates = [300, 750, 1200, 1850, 2850, 4300]
+#delay between a request and the first packet of the segment in microseconds
+requestDelay = 20000
+#the client waits with the next request while it has more than this many microseconds buffered
+maxBuffer = 30000000
+
+#a double divided from microseconds, printed with the default precision of an ostream
+def fmt(us):
+    return "%g" % (us / 1000000.0)
+
+#returns the bottleneck rate at a time, changes are (time in microseconds, Kbps) sorted by time
+def bottleneck_rate(rate, changes, now):
+    for time, changed in changes:
+        if time > now:
+            break
+        rate = changed
+    return rate
+
+#segment sizes in bytes of one video, every client streams the same video
+def segment_sizes(nSegments, segmentDuration, rand):
+    return [[int(r * segmentDuration / 8000 * rand.uniform(0.8, 1.2)) for s in range(nSegments)] for r in representationRates]
+
+#simulate one client, returns its rows as (write time, type, index, time, a, b, c) with the record types of the binary log
+#and its packets as (times, bytes) arrays, the packets are binned or written as rows later
+def simulate_client(nClients, duration, packetRate, rate, changes, segmentDuration, sizes, rand):
+    rows = []
+    packetTimes = []
+    packetBytes = []
+    lastSegment = len(sizes[0]) - 1
+    client = {"state": "initial", "segment": 0, "playback": 0, "inBuffer": 0, "underrun": False, "rep": 0, "delay": 0,
+              "bufferNew": 0, "lastEnd": 0, "throughput": None, "reps": [], "request": 0, "start": 0}
+    events = []
+    order = [0]
+
+    def schedule(time, event):
+        order[0] += 1
+        heapq.heappush(events, (time, order[0], event))
+
+    def buffer_level(now):
+        return max(client["bufferNew"] - (now - client["lastEnd"]), 0) if client["segment"] > 0 else 0
+
+    #picks the highest representation below the last segment throughput and delays the request while the buffer is full
+    def request_rep(now):
+        if client["throughput"] is not None:
+            client["rep"] = max([i for i, r in enumerate(representationRates) if r <= 0.8 * client["throughput"]] or [0])
+        client["delay"] = max(buffer_level(now) - maxBuffer, 0)
+        client["reps"].append(client["rep"])
+        rows.append((now, 5, client["segment"], now, client["rep"], 0, 1 if client["delay"] > 0 else 0))
+
+    def send(now):
+        size = sizes[client["rep"]][client["segment"]]
+        share = bottleneck_rate(rate, changes, now) / float(nClients) * rand.uniform(0.7, 1.3)
+        start = now + requestDelay
+        end = start + max(int(size * 8000 / share), 1)
+        n = max(int((end - start) * packetRate / 1000000), 1)
+        times = np.linspace(start, end, n + 1)[1:].astype("int64")
+        sent = np.full(n, size // n, dtype = "int64")
+        sent[-1] += size - sent.sum()
+        packetTimes.append(times)
+        packetBytes.append(sent)
+        client["request"] = now
+        client["start"] = start
+        schedule(end, "downloadFinished")
+
+    def log_underrun(now, empty):
+        rows.append((now, 4, -1, now, 1 if empty else 0, 0, 0))
+
+    def playback(now):
+        rows.append((now, 3, -1, now, buffer_level(now), 0, 0))
+        if client["inBuffer"] == 0 and client["playback"] < lastSegment and not client["underrun"]:
+            client["underrun"] = True
+            log_underrun(now, True)
+            return True
+        elif client["inBuffer"] > 0:
+            if client["underrun"]:
+                client["underrun"] = False
+                log_underrun(now, False)
+            rows.append((now, 6, client["playback"], now, client["reps"][client["playback"]], 0, 0))
+            client["inBuffer"] -= 1
+            client["playback"] += 1
+            return False
+        return True
+
+    def segment_received(now):
+        size = sizes[client["rep"]][client["segment"]]
+        bufferOld = max(client["bufferNew"] - (now - client["lastEnd"]), 0) if client["segment"] > 0 else 0
+        client["bufferNew"] = bufferOld + segmentDuration
+        client["lastEnd"] = now
+        client["throughput"] = size * 8000.0 / max(now - client["start"], 1)
+        rows.append((now, 2, client["segment"], client["request"], client["start"], now, size))
+        client["inBuffer"] += 1
+        if client["segment"] == lastSegment:
+            client["delay"] = 0
+        controller(now, "downloadFinished")
+
+    #the controller of TcpStreamClient
+    def controller(now, event):
+        state = client["state"]
+        if state == "initial":
+            request_rep(now)
+            client["state"] = "downloading"
+            log_underrun(now, False)
+            send(now)
+        elif state == "downloading":
+            playback(now)
+            if client["playback"] <= lastSegment:
+                client["segment"] += 1
+                request_rep(now)
+                client["state"] = "downloadingPlaying"
+                send(now)
+            else:
+                client["state"] = "playing"
+            schedule(now + segmentDuration, "playbackFinished")
+        elif state == "downloadingPlaying":
+            if event == "downloadFinished":
+                if client["segment"] < lastSegment:
+                    client["segment"] += 1
+                    request_rep(now)
+                if client["delay"] > 0 and client["segment"] <= lastSegment:
+                    client["state"] = "playing"
+                    schedule(now + client["delay"], "irdFinished")
+                elif client["segment"] == lastSegment:
+                    client["state"] = "playing"
+                else:
+                    send(now)
+            elif event == "playbackFinished":
+                if not playback(now):
+                    schedule(now + segmentDuration, "playbackFinished")
+                else:
+                    client["state"] = "downloading"
+        elif state == "playing":
+            if event == "irdFinished":
+                client["state"] = "downloadingPlaying"
+                send(now)
+            elif event == "playbackFinished" and client["playback"] < lastSegment:
+                playback(now)
+                schedule(now + segmentDuration, "playbackFinished")
+            elif event == "playbackFinished" and client["playback"] == lastSegment:
+                log_underrun(now, False)
+                playback(now)
+                client["state"] = "terminal"
+
+    schedule(int(rand.uniform(0, 100000)), "start")
+    while events:
+        now, _, event = heapq.heappop(events)
+        if now > duration:
+            break
+        if event == "downloadFinished":
+            segment_received(now)
+        else:
+            controller(now, event)
+    times = np.concatenate(packetTimes) if packetTimes else np.empty(0, "int64")
+    sent = np.concatenate(packetBytes) if packetBytes else np.empty(0, "int64")
+    keep = times <= duration
+    return rows, times[keep], sent[keep]
+
+#sums the packets into bins like ThroughputBinInterval, a bin is written with the first packet of a later bin and empty bins in between are written too
+#the last bin is written when the application stops
+def bin_packets(times, sent, interval, duration):
+    rows = []
+    if len(times) == 0:
+        return rows
+    bins = times - times % interval
+    starts, first = np.unique(bins, return_index = True)
+    sums = np.add.reduceat(sent, first)
+    for i, binStart in enumerate(starts):
+        writeTime = times[first[i + 1]] if i + 1 < len(starts) else duration
+        rows.append((writeTime, 1, -1, binStart, sums[i], interval, 0))
+        if i + 1 < len(starts):
+            for empty in range(binStart + interval, starts[i + 1], interval):
+                rows.append((writeTime, 1, -1, empty, 0, interval, 0))
+    return rows
+
+def format_row(row, binned):
+    writeTime, kind, index, time, a, b, c = row
+    if kind == 1:
+        return fmt(time) + ";;;;;;;;;;;;" + str(a) + (";;" + fmt(b) + "\n" if binned else ";\n")
+    if kind == 2:
+        return ";" + str(index) + ";" + fmt(time) + ";" + fmt(a) + ";" + fmt(b) + ";" + str(c) + ";Y;;;;;;;\n"
+    if kind == 3:
+        return fmt(time) + ";;;;;;;;;;;" + fmt(a) + ";;\n"
+    if kind == 4:
+        return fmt(time) + ";;;;;;;;;;;;;" + str(a) + "\n"
+    if kind == 5:
+        return fmt(time) + ";" + str(index) + ";;;;;;;" + str(a) + ";" + str(b) + ";" + str(c) + ";;;\n"
+    return fmt(time) + ";" + str(index) + ";;;;;;" + str(a) + ";;;;;;\n"
+
+#write the rows of a client in the order they were logged, packets that are not binned are merged in by their time
+def write_client_log(file, rows, times, sent, logFormat, binInterval, duration):
+    if binInterval > 0:
+        rows = rows + bin_packets(times, sent, binInterval, duration)
+        times = sent = np.empty(0, "int64")
+    rows.sort(key = lambda row: row[0])
+    rowTimes = np.array([row[0] for row in rows], dtype = "int64")
+    #a row logged at the time of a packet comes after it, e.g. the download row of a segment follows its last packet
+    positions = np.searchsorted(times, rowTimes, side = "right") + np.arange(len(rows))
+    isRow = np.zeros(len(rows) + len(times), dtype = bool)
+    isRow[positions] = True
+    if logFormat == "binary":
+        records = np.zeros(len(isRow), dv.binaryLogDtype)
+        records["type"][isRow] = [row[1] for row in rows]
+        for i, field in enumerate(["index", "time", "a", "b", "c"]):
+            records[field][isRow] = [row[i + 2] for row in rows]
+        records["type"][~isRow] = 1
+        records["index"][~isRow] = -1
+        records["time"][~isRow] = times
+        records["a"][~isRow] = sent
+        with open(file, "wb") as log:
+            log.write(dv.binaryLogMagic)
+            log.write(records.tobytes())
+        return
+    lines = np.empty(len(isRow), dtype = object)
+    lines[isRow] = [format_row(row, binInterval > 0) for row in rows]
+    lines[~isRow] = [fmt(t) + ";;;;;;;;;;;;" + str(b) + ";\n" for t, b in zip(times.tolist(), sent.tolist())]
+    with open(file, "w") as log:
+        log.write(logHeader + (";Bin_Duration\n" if binInterval > 0 else "\n"))
+        log.writelines(lines)
+
+#the event log of DashEventScheduler, the initial rate is logged at time 0 and every change when it is applied
+def write_event_log(file, rate, changes):
+    with open(file, "w") as log:
+        log.write("Time_Now;Event;Value\n")
+        log.write("0;BottleneckRate;" + str(rate) + "\n")
+        for time, changed in changes:
+            log.write(fmt(time) + ";BottleneckRate;" + str(changed) + "\n")
+
+#write the logs of a simulation to path, returns the client log files
+#duration is in seconds, changes are (seconds, Kbps) bottleneck rate changes and binInterval is in microseconds
+def generate(path, simId, clients, duration, packetRate = 100, rate = 5000, changes = (), logFormat = "text", binInterval = 0,
+             segmentDuration = 2, seed = 0, algorithms = None):
+    os.makedirs(path, exist_ok=True)
+    rand = random.Random(seed)
+    algorithms = algorithms or dv.abrAlgorithms
+    durationUs = int(duration * 1000000)
+    segmentUs = int(segmentDuration * 1000000)
+    changes = sorted((int(time * 1000000), int(changed)) for time, changed in changes)
+    sizes = segment_sizes(max(int(duration // segmentDuration), 1), segmentUs, rand)
+    files = []
+    for c in range(clients):
+        rows, times, sent = simulate_client(clients, durationUs, packetRate, rate, changes, segmentUs, sizes, random.Random(rand.random()))
+        f = path + "/sim" + str(simId) + "_cl" + str(c) + "_" + algorithms[c % len(algorithms)] + ("_output.bin" if logFormat == "binary" else "_output.txt")
+        write_client_log(f, rows, times, sent, logFormat, binInterval, durationUs)
+        files.append(f)
+    write_event_log(path + "/sim" + str(simId) + "_event_log.txt", rate, changes)
+    return files
+
+#"30:2000" is a change of the bottleneck rate to 2000 Kbps after 30 seconds
+def parse_change(change):
+    time, changed = change.split(":")
+    return float(time), int(changed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic DASH client logs and event logs.")
+    parser.add_argument("--name", default="synthetic", help="simulation name, the logs go to dash-log-files/<name>/<clients>/")
+    parser.add_argument("--simId", type=int, default=0)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60, help="simulated seconds")
+    parser.add_argument("--packetRate", type=int, default=100, help="logged packets per second while a client downloads")
+    parser.add_argument("--rate", type=int, default=5000, help="bottleneck rate at the start in Kbps")
+    parser.add_argument("--changes", type=parse_change, nargs="*", default=[], help="bottleneck rate changes as seconds:Kbps")
+    parser.add_argument("--segmentDuration", type=float, default=2)
+    parser.add_argument("--logFormat", choices=["text", "binary"], default="text")
+    parser.add_argument("--binInterval", type=int, default=0, help="throughput bin interval in microseconds, 0 logs every packet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files = generate(dv.path + args.name + "/" + str(args.clients), args.simId, args.clients, args.duration, args.packetRate, args.rate,
+                     args.changes, args.logFormat, args.binInterval, args.segmentDuration, args.seed)
+    print("wrote " + str(len(files)) + " client logs to " + dv.path + args.name + "/" + str(args.clients))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# Timers, counters and cache hit ratios for dash_visualization.py
+# The numbers are kept per process. The dashboard serves them as JSON on /metrics and shows them in its debug panel
+
+import cProfile
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+#pyinstrument profiles are easier to read, cProfile is used when it is not installed
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+profileDir = os.environ.get("DASH_PROFILE_DIR", "./dash-profiles/")
+
+class Metrics(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+        #callbacks whose next run is profiled, DASH_PROFILE_CALLBACKS is a comma separated list of callback names
+        self.profileNext = set(name for name in os.environ.get("DASH_PROFILE_CALLBACKS", "").split(",") if name)
+        self.profiles = []
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.timers = {}
+            self.counters = {}
+            self.caches = {}
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            timer["count"] += 1
+            timer["total"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            timer["last"] = seconds
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    #decorator that times every call of a function as stage name
+    def timed(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, n = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache(self, name, hit):
+        with self.lock:
+            cache = self.caches.get(name)
+            if cache is None:
+                cache = self.caches[name] = {"hits": 0, "misses": 0}
+            cache["hits" if hit else "misses"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {"uptime": time.time() - self.started, "pid": os.getpid(),
+                    "timers": {name: dict(timer, mean = timer["total"] / timer["count"]) for name, timer in sorted(self.timers.items())},
+                    "counters": dict(sorted(self.counters.items())),
+                    "caches": {name: dict(cache, ratio = cache["hits"] / float(cache["hits"] + cache["misses"])) for name, cache in sorted(self.caches.items())},
+                    "profileNext": sorted(self.profileNext), "profiles": list(self.profiles)}
+
+    #profile the next run of the callback with this function name
+    def profile_next(self, name):
+        with self.lock:
+            self.profileNext.add(name)
+
+    #decorator for dash callbacks, every run is timed as callback.<name> and profiled if it was requested
+    def callback(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.lock:
+                profile = func.__name__ in self.profileNext
+                self.profileNext.discard(func.__name__)
+            with self.timer("callback." + func.__name__):
+                if profile:
+                    return self.run_profiled(func, args, kwargs)
+                return func(*args, **kwargs)
+        return wrapper
+
+    #run a function under the profiler, the profile is written to profileDir even if the function raises
+    def run_profiled(self, func, args, kwargs):
+        os.makedirs(profileDir, exist_ok=True)
+        file = profileDir + func.__name__ + "_" + time.strftime("%Y%m%d-%H%M%S") + "_" + str(os.getpid())
+        if pyinstrument is not None:
+            profiler = pyinstrument.Profiler()
+            profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop()
+                file += ".html"
+                with open(file, "w") as profileFile:
+                    profileFile.write(profiler.output_html())
+                with self.lock:
+                    self.profiles.append(file)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            #read it with `python -m pstats <file>` or snakeviz
+            file += ".prof"
+            profiler.dump_stats(file)
+            with self.lock:
+                self.profiles.append(file)
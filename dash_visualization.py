@@ -8,52 +8,210 @@ import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import re
-from dash.dependencies import Input, Output, State
+import io
+import json
+import sqlite3
+import sys
+import time
+from dash.dependencies import Input, Output, State, MATCH, ALL
+from dash.exceptions import PreventUpdate
 
 import os
 from os import mkdir
-from os import system
 from os import listdir
 from os.path import isfile, join
 
-from functools import reduce
+from functools import cmp_to_key
+from collections import OrderedDict
+import threading
+import uuid
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from simulation_jobs import JobManager, waf_command
+from live_watcher import RunWatcher
+from dash_metrics import Metrics
+import flask
+
+#feather needs pyarrow, pickled frames are used as sidecar cache otherwise
+try:
+    import pyarrow
+    cacheFormat = "feather"
+except ImportError:
+    cacheFormat = "pickle"
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.SLATE], suppress_callback_exceptions=True)
+#WSGI entry point for multi process servers, e.g. `gunicorn -w 4 dash_visualization:server` from the ns-3 directory
+server = app.server
+
+#timers of the callbacks and their stages, counters and cache hit ratios of this worker process
+metrics = Metrics()
+#DASH_DEBUG_PANEL=1 adds a tab that shows the metrics
+debugPanel = os.environ.get("DASH_DEBUG_PANEL", "0") == "1"
+
+@server.before_request
+def start_request_timer():
+    flask.g.requestStart = time.perf_counter()
+
+#a callback request is timed as request.<callback>, its time minus callback.<callback> is spent in dash and in the JSON serialization
+@server.after_request
+def record_request(response):
+    if flask.request.path.endswith("_dash-update-component") and "requestStart" in flask.g:
+        output = (flask.request.get_json(silent=True) or {}).get("output")
+        callback = app.callback_map.get(output, {}).get("callback")
+        name = callback.__name__ if callback is not None else str(output)
+        metrics.add_time("request." + name, time.perf_counter() - flask.g.requestStart)
+        metrics.count("response_bytes." + name, response.calculate_content_length() or 0)
+    return response
+
+@server.route("/metrics")
+def serve_metrics():
+    return flask.jsonify(metrics.snapshot())
+
+@server.route("/metrics/reset", methods=["POST"])
+def reset_metrics():
+    metrics.reset()
+    return flask.jsonify(metrics.snapshot())
+
+#`curl -X POST localhost:8050/metrics/profile/update_allGraphs` profiles the next run of that callback in this worker
+@server.route("/metrics/profile/<name>", methods=["POST"])
+def profile_callback(name):
+    metrics.profile_next(name)
+    return flask.jsonify(metrics.snapshot())
 
 
 path = "./dash-log-files/" 
 scratchPath = "./scratch/"
 
-client_data = {}
-eventLog_data = {}
-live_client_data = {}
-app_state = { "loading" : False, "simFinished" : True, "realTimeFile" : "", "eventSchedule" : [], "clients": [], "nrClients": 0}
 extract_unit = { 
-                "bl" : {"index": "Time_Now", "value": "Buffer_Level", "resample": True, "timeUnit": 'seconds', "y_axis": "BufferLevel(seconds)" ,"title": "Buffer Level", "line_shape": 'hv' },
-                "tp" : {"index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Kb","title": "Throughput", "line_shape": 'linear'},
-                "eff" : {"index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Capacity used","title": "Efficiency", "line_shape": 'linear'},
-                "bul" : {"index": "Time_Now", "value": "Buffer_Underrun", "resample": True, "timeUnit": 'seconds', "y_axis": "Buffer Underrun" ,"title": "Buffer Underrun", "line_shape": 'hv'},
-                "segSize" : {"index": "Download_Request_Sent", "value": "Segment_Size", "resample": True, "timeUnit": 'seconds', "y_axis": "Size (Bit)","title": "Segment Size", "line_shape": 'hv'},
-                "qualLevel" : {"index": "Time_Now", "value": "Rep_Level", "resample": True, "timeUnit": 'seconds', "y_axis": "Quality Level","title": "Quality Level", "line_shape": 'hv'},
+                "bl" : {"table": "buffer", "index": "Time_Now", "value": "Buffer_Level", "resample": True, "timeUnit": 'seconds', "y_axis": "BufferLevel(seconds)" ,"title": "Buffer Level", "line_shape": 'hv' },
+                "tp" : {"table": "packets", "index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Kb","title": "Throughput", "line_shape": 'linear'},
+                "eff" : {"table": "packets", "index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Capacity used","title": "Efficiency", "line_shape": 'linear'},
+                "bul" : {"table": "underruns", "index": "Time_Now", "value": "Buffer_Underrun", "resample": True, "timeUnit": 'seconds', "y_axis": "Buffer Underrun" ,"title": "Buffer Underrun", "line_shape": 'hv'},
+                "segSize" : {"table": "segments", "index": "Download_Request_Sent", "value": "Segment_Size", "resample": True, "timeUnit": 'seconds', "y_axis": "Size (Bit)","title": "Segment Size", "line_shape": 'hv'},
+                "qualLevel" : {"table": "decisions", "index": "Time_Now", "value": "Rep_Level", "resample": True, "timeUnit": 'seconds', "y_axis": "Quality Level","title": "Quality Level", "line_shape": 'hv'},
                 }
 
 live_extract_unit = { 
-                "bl" : {"index": "Time_Now", "value": "Buffer_Level", "resample": False, "timeUnit": 'nanoseconds', "y_axis": "BufferLevel(seconds)" ,"title": "Buffer Level", "line_shape": 'hv' },
-                "tp" : {"index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Kb","title": "Throughput", "line_shape": 'linear'},
-                "eff" : {"index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Capacity used","title": "Efficiency", "line_shape": 'linear'},
-                "bul" : {"index": "Time_Now", "value": "Buffer_Underrun", "resample": False, "timeUnit": 'nanoseconds', "y_axis": "Buffer Underrun" ,"title": "Buffer Underrun", "line_shape": 'hv'},
-                "segSize" : {"index": "Download_Request_Sent", "value": "Segment_Size", "resample": False, "timeUnit": 'nanoseconds', "y_axis": "Size (Bit)","title": "Segment Size", "line_shape": 'hv'},
-                "qualLevel" : {"index": "Time_Now", "value": "Rep_Level", "resample": False, "timeUnit": 'nanoseconds', "y_axis": "Quality Level","title": "Quality Level", "line_shape": 'hv'},
+                "bl" : {"table": "buffer", "index": "Time_Now", "value": "Buffer_Level", "resample": False, "timeUnit": 'seconds', "y_axis": "BufferLevel(seconds)" ,"title": "Buffer Level", "line_shape": 'hv' },
+                "tp" : {"table": "packets", "index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Kb","title": "Throughput", "line_shape": 'linear'},
+                "eff" : {"table": "packets", "index": "Time_Now", "value": "Bytes_Received", "resample": True, "timeUnit": 'seconds', "y_axis": "Capacity used","title": "Efficiency", "line_shape": 'linear'},
+                "bul" : {"table": "underruns", "index": "Time_Now", "value": "Buffer_Underrun", "resample": False, "timeUnit": 'seconds', "y_axis": "Buffer Underrun" ,"title": "Buffer Underrun", "line_shape": 'hv'},
+                "segSize" : {"table": "segments", "index": "Download_Request_Sent", "value": "Segment_Size", "resample": False, "timeUnit": 'seconds', "y_axis": "Size (Bit)","title": "Segment Size", "line_shape": 'hv'},
+                "qualLevel" : {"table": "decisions", "index": "Time_Now", "value": "Rep_Level", "resample": False, "timeUnit": 'seconds', "y_axis": "Quality Level","title": "Quality Level", "line_shape": 'hv'},
                 }
 aggregated_units = { "avgTp": {'unit': 'tp', 'aggregation': 'avg'},
                     "avgBl": {'unit': 'bl', 'aggregation': 'avg'},
                     "avgSegSize": {'unit': 'segSize', 'aggregation': 'avg'},
                     "avgQualLevel": {'unit': 'qualLevel', 'aggregation': 'avg'},
-                    "totalEff": {'unit': 'eff', 'aggregation': 'stacked_sum'} }
+                    "totalEff": {'unit': 'eff', 'aggregation': 'stacked_sum'},
+                    "bandTp": {'unit': 'tp', 'aggregation': 'band'},
+                    "bandBl": {'unit': 'bl', 'aggregation': 'band'},
+                    "ciTp": {'unit': 'tp', 'aggregation': 'ci'},
+                    "ciBl": {'unit': 'bl', 'aggregation': 'ci'} }
+#graphs of the scalar metrics that have no display function of their own
+kpiGraphs = { "stalls": {"title": "Stalls", "y_axis": "Stalls"},
+              "startupDelay": {"title": "Startup Delay", "y_axis": "Startup Delay (seconds)"},
+              "qualChangeMagnitude": {"title": "Quality Change Magnitude", "y_axis": "Mean Levels per Change"} }
 congestionProtocols = [{"label": 'TcpNewReno', "value": 'ns3::TcpNewReno'}, {"label": 'TcpWestwood', "value": 'ns3::TcpWestwood'}, {"label": 'TcpVegas', "value": 'ns3::TcpVegas'}, {"label": 'TcpVeno', "value": 'ns3::TcpVeno'}, {"label": 'TcpBic', "value": 'ns3::TcpBic'}] #{"label": 'TcpCubic', "value": 'ns3::TcpCubic'}
 abrAlgorithms = ["panda", "tobasco", "festive"]
 
+#column types of the client logs written by TcpStreamClient
+clientLogDtypes = {
+                "Time_Now": "float64", "Segment_Index": "float32", "Download_Request_Sent": "float64", "Download_Start": "float64",
+                "Download_End": "float64", "Segment_Size": "float64", "Download_OK": "category", "Quality_Level": "float32",
+                "Rep_Level": "float32", "Case": "float32", "DelayCase": "float32", "Buffer_Level": "float32",
+                "Bytes_Received": "float64", "Buffer_Underrun": "float32", "Bin_Duration": "float64"
+                }
+#every row of a client log is one record, the key column tells which kind of record it is
+recordTables = {
+                "packets" : {"key": "Bytes_Received", "columns": {"Time_Now": "float64", "Bytes_Received": "int64", "Bin_Duration": "float64"}},
+                "segments" : {"key": "Download_OK", "columns": {"Segment_Index": "int32", "Download_Request_Sent": "float64", "Download_Start": "float64", "Download_End": "float64", "Segment_Size": "int64"}},
+                "buffer" : {"key": "Buffer_Level", "columns": {"Time_Now": "float64", "Buffer_Level": "float32"}},
+                "underruns" : {"key": "Buffer_Underrun", "columns": {"Time_Now": "float64", "Buffer_Underrun": "int8"}},
+                "decisions" : {"key": "Rep_Level", "columns": {"Time_Now": "float64", "Segment_Index": "int32", "Rep_Level": "int16", "Case": "float32", "DelayCase": "float32"}},
+                "playback" : {"key": "Quality_Level", "columns": {"Time_Now": "float64", "Segment_Index": "int32", "Quality_Level": "int16"}},
+                }
+#record layout of the binary client logs written by TcpStreamClient with LogFormat=binary, the file starts with binaryLogMagic
+binaryLogMagic = b"DASHBIN1"
+binaryLogDtype = np.dtype([("type", "u1"), ("pad", "V3"), ("index", "<i4"), ("time", "<i8"), ("a", "<i8"), ("b", "<i8"), ("c", "<i8")])
+#record type and the field of every column of the record tables, times and buffer levels are logged in microseconds
+binaryRecords = {
+                "packets" : {"type": 1, "fields": {"Time_Now": "time", "Bytes_Received": "a", "Bin_Duration": "b"}},
+                "segments" : {"type": 2, "fields": {"Segment_Index": "index", "Download_Request_Sent": "time", "Download_Start": "a", "Download_End": "b", "Segment_Size": "c"}},
+                "buffer" : {"type": 3, "fields": {"Time_Now": "time", "Buffer_Level": "a"}},
+                "underruns" : {"type": 4, "fields": {"Time_Now": "time", "Buffer_Underrun": "a"}},
+                "decisions" : {"type": 5, "fields": {"Time_Now": "time", "Segment_Index": "index", "Rep_Level": "a", "Case": "b", "DelayCase": "c"}},
+                "playback" : {"type": 6, "fields": {"Time_Now": "time", "Segment_Index": "index", "Quality_Level": "a"}},
+                }
+binaryMicroseconds = ["Time_Now", "Download_Request_Sent", "Download_Start", "Download_End", "Buffer_Level", "Bin_Duration"]
+#packet rows of clients with a ThroughputBinInterval hold the bytes of a whole bin, Bin_Duration is 0 for single packets and in older logs
+recordDefaults = {"Bin_Duration": 0.0}
+#parsed logs are cached in this subdirectory of the simulation folder
+cacheDir = ".cache"
+#increase whenever the layout of the cached frames changes
+cacheVersion = 4
+#number of processes used to parse client logs, 1 disables parallel ingestion
+ingestWorkers = int(os.environ.get("DASH_INGEST_WORKERS", os.cpu_count() or 1))
+#smaller simulations are parsed serially, starting the pool costs more than it saves
+parallelThreshold = 4
+ingestPool = None
+ingestPoolLock = threading.Lock()
+#number of clients after the selected ones whose graphs are loaded in the background, 0 disables the prefetch
+prefetchClients = int(os.environ.get("DASH_PREFETCH_CLIENTS", 8))
+#units of the selected clients that are loaded in the background
+prefetchUnits = ["tp", "bl", "qualLevel", "bul"]
+#a single thread, the prefetch never takes more than one core from the callbacks
+prefetchPool = ThreadPoolExecutor(max_workers = 1)
+prefetchLock = threading.Lock()
+#runs that were loaded before they were indexed are indexed in their own thread, so the prefetch does not wait for a whole run
+indexPool = ThreadPoolExecutor(max_workers = 1)
+#(simName, nrClients, simId) of the runs that are queued or being indexed in indexPool
+indexingRuns = set()
+indexingRunsLock = threading.Lock()
+#summary of all finished runs, lets the results tab find runs and their metrics without reading the logs
+indexFile = path + "summary_index.sqlite"
+#index files whose tables were set up by this process
+indexSchemas = set()
+indexSchemasLock = threading.Lock()
+#scalar metrics of a client that are stored in the summary index, compute_client_kpis returns all of them
+#bufferUnderruns is the time the client stalled in seconds, avgQuality the quality weighted by the time it was chosen for, meanQuality the mean of the decisions
+indexedKpis = ["bufferUnderruns", "avgQuality", "qualChanges", "avgEff", "qualChangeMagnitude", "stalls", "startupDelay", "meanQuality"]
+#raised when the metrics are computed differently, the metrics of an index with another version are computed again
+kpiVersion = 2
+#record tables compute_client_kpis reads
+kpiTables = ["decisions", "underruns", "playback", "packets"]
+#points per trace sent to the browser, zooming in fetches the full resolution of the visible range, at least the minimum and maximum of one bucket
+maxTracePoints = max(int(os.environ.get("DASH_MAX_TRACE_POINTS", 2000)), 2)
+#number of figures kept for re-selected graphs
+figureCacheSize = 32
+figureCache = OrderedDict()
+figureCacheLock = threading.Lock()
+#clients x seconds matrices of every unit of a simulation are kept in its "matrices", aggregations of any group of clients are reductions over their rows
+unitMatricesLock = threading.Lock()
+#number of simulations a worker process keeps in memory, a simulation that was dropped is loaded again from the sidecar cache
+loadedSimulationsSize = int(os.environ.get("DASH_LOADED_SIMULATIONS", 4))
+#percentiles of the 'band' aggregation: outer band, inner band and median
+bandPercentiles = [5, 25, 50, 75, 95]
+#resamples and confidence level of the bootstrap interval of the 'ci' aggregation
+bootstrapSamples = 200
+ciLevel = 0.95
+#figures with more traces or points than this are drawn with WebGL
+glTraceThreshold = 50
+glPointThreshold = 50000
+#seconds of data kept per live series, unset keeps the whole run
+liveWindow = float(os.environ["DASH_LIVE_WINDOW"]) if "DASH_LIVE_WINDOW" in os.environ else None
+#points a live trace keeps in the browser, older points are dropped when new ones are appended
+liveMaxPoints = int(os.environ.get("DASH_LIVE_MAX_POINTS", 5000))
+#milliseconds between live updates, the interval doubles up to the maximum while no new data arrives and drops back with the next data
+liveMinInterval = 250
+liveMaxInterval = 4000
+#simulations started from the dashboard run in the background, by default as many at once as there are cores
+#the tree is built before every simulation by one build at a time, the simulations run with --run-no-build
+simJobs = JobManager(int(os.environ.get("DASH_SIM_JOBS", 0)) or None, buildCommand = ["./waf", "build"])
+
 
 #returns the id of a simulation file
 def get_sim_id(file):
@@ -63,6 +221,10 @@ def get_sim_id(file):
     else:
         return -1
 
+#returns the nr of a simulation id, so sim10 is sorted after sim2
+def get_sim_nr(simId):
+    return int(simId[3:])
+
 #returns the nr of a client
 def get_client_nr(client):
     match = re.search(r"^sim\d+_cl(\d+)", client)
@@ -85,11 +247,197 @@ def cmp_clients(c1, c2):
 def get_outputs(path, simId):
     outputs = []
     for f in list( listdir( path )):
-        if (str(f).startswith(simId) and not str(f).find('cl') == -1 and str(f).endswith("output.txt")):
+        if is_client_output(f, simId):
             outputs.append(str(f))
-    outputs.sort(cmp_clients)
+    outputs.sort(key = cmp_to_key(cmp_clients))
     return outputs
 
+#every worker process keeps the data of the simulations its callbacks used last, keyed by (simName, nrClients, simId)
+#which simulation a session looks at is stored in the summary index, so every worker of a multi process server can serve every session
+loadedSimulations = OrderedDict()
+loadedSimulationsLock = threading.Lock()
+boundSimulation = threading.local()
+
+#clients are loaded lazily, "clients" starts with the path, size and algorithm of every client and units are added when a graph needs them
+#unitLock is held while units are added, so a graph waits for a prefetch of the same clients instead of extracting them twice
+def new_simulation_data(key):
+    return {"key": key, "clients": {}, "eventLog": {}, "matrices": {}, "lock": threading.Lock(), "unitLock": threading.RLock(), "prefetch": 0}
+
+#used when no simulation is bound, e.g. by the command line tools that call load_data directly
+defaultSimulation = new_simulation_data(None)
+
+def get_bound_simulation():
+    return getattr(boundSimulation, "sim", defaultSimulation)
+
+#the dict of the simulation bound to the current thread, callbacks of different sessions run in different threads and do not see each other's data
+class BoundDict(MutableMapping):
+    def __init__(self, name):
+        self.name = name
+
+    def data(self):
+        return get_bound_simulation()[self.name]
+
+    def __getitem__(self, key):
+        return self.data()[key]
+
+    def __setitem__(self, key, value):
+        self.data()[key] = value
+
+    def __delitem__(self, key):
+        del self.data()[key]
+
+    def __iter__(self):
+        return iter(self.data())
+
+    def __len__(self):
+        return len(self.data())
+
+client_data = BoundDict("clients")
+eventLog_data = BoundDict("eventLog")
+
+#read the logs of a simulation into sim, its cached figures are dropped
+def load_simulation(sim):
+    boundSimulation.sim = sim
+    with figureCacheLock:
+        for figureKey in [k for k in figureCache if k[0] == sim["key"]]:
+            del figureCache[figureKey]
+    simName, nrClients, simId = sim["key"]
+    loadEventLog(path + simName + "/" + nrClients, simId)
+    load_data(path + simName + "/" + nrClients, simId)
+    load_indexed_kpis(simName, nrClients, simId)
+    sim["loaded"] = True
+
+#bind a simulation to the current thread, it is loaded if this worker does not have it in memory
+#reload reads the logs into a new simulation dict that replaces the old one once it is complete
+#sessions and the prefetch that still use the old dict never see it half filled
+def bind_simulation(key, reload = False):
+    with loadedSimulationsLock:
+        sim = loadedSimulations.get(key)
+        if sim is None:
+            sim = new_simulation_data(key)
+            loadedSimulations[key] = sim
+        loadedSimulations.move_to_end(key)
+        while len(loadedSimulations) > loadedSimulationsSize:
+            loadedSimulations.popitem(last = False)
+    #other threads that bind the same simulation wait until it is loaded
+    with sim["lock"]:
+        metrics.cache("simulation", not reload and sim.get("loaded", False))
+        if not sim.get("loaded"):
+            load_simulation(sim)
+            reload = False
+    if reload:
+        sim = new_simulation_data(key)
+        with sim["lock"]:
+            load_simulation(sim)
+        with loadedSimulationsLock:
+            loadedSimulations[key] = sim
+            loadedSimulations.move_to_end(key)
+            while len(loadedSimulations) > loadedSimulationsSize:
+                loadedSimulations.popitem(last = False)
+        #figures built from the old dict while the new one was loaded
+        with figureCacheLock:
+            for figureKey in [k for k in figureCache if k[0] == key]:
+                del figureCache[figureKey]
+    boundSimulation.sim = sim
+    return sim
+
+#bind the simulation the session loaded, returns False if it has not loaded one
+def bind_session(sessionId):
+    key = get_session_simulation(sessionId)
+    if key is None:
+        return False
+    bind_simulation(key)
+    return True
+
+def get_session_simulation(sessionId):
+    with open_index() as connection:
+        row = connection.execute("SELECT simName, nrClients, simId FROM sessions WHERE sessionId = ?", (sessionId,)).fetchone()
+    return tuple(row) if row else None
+
+#remember which simulation a session loaded, sessions that were not used for a day are removed
+def set_session_simulation(sessionId, key):
+    with open_index() as connection:
+        connection.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)", (sessionId,) + tuple(key) + (time.time(),))
+        connection.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - 24 * 3600,))
+
+#the scenario a session sets up on the New Simulation tab, kept in the summary index next to the session's simulation
+#updates are read-modify-write transactions that take the database write lock, so concurrent callbacks of a session never lose an update
+sessionStateDefaults = {"clients": [], "eventSchedule": [], "nrClients": 0}
+
+class SessionState(object):
+    def __init__(self, sessionId):
+        self.sessionId = sessionId
+
+    def load(self, connection):
+        row = connection.execute("SELECT state FROM session_state WHERE sessionId = ?", (self.sessionId,)).fetchone()
+        state = json.loads(json.dumps(sessionStateDefaults))
+        if row:
+            state.update(json.loads(row[0]))
+        return state
+
+    def get(self):
+        with open_index() as connection:
+            return self.load(connection)
+
+    #yields the state of the session, changes to it are stored when the block ends
+    @contextmanager
+    def update(self):
+        with open_index() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            state = self.load(connection)
+            yield state
+            connection.execute("INSERT OR REPLACE INTO session_state VALUES (?, ?, ?)", (self.sessionId, json.dumps(state), time.time()))
+            connection.execute("DELETE FROM session_state WHERE updated < ?", (time.time() - 24 * 3600,))
+
+#runs a call once for all threads that ask for the same key while it is in flight, they all get its result
+#overlapping interval ticks of a live run share one read of the logs instead of skipping or repeating it
+class SingleFlight(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"done": threading.Event(), "result": None, "error": None}
+                self.calls[key] = call
+        metrics.cache("single_flight", not leader)
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+        try:
+            call["result"] = func()
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call["done"].set()
+        return call["result"]
+
+#the live series of every live run this worker read, keyed by (path, simId), sessions that watch the same run share them
+liveRuns = OrderedDict()
+liveRunsLock = threading.Lock()
+liveLoads = SingleFlight()
+
+def get_live_run(path, simId):
+    with liveRunsLock:
+        run = liveRuns.get((path, simId))
+        if run is None:
+            run = {"clients": {}, "lock": threading.Lock()}
+            liveRuns[(path, simId)] = run
+        liveRuns.move_to_end((path, simId))
+        while len(liveRuns) > loadedSimulationsSize:
+            evicted = liveRuns.popitem(last = False)[1]
+            if evicted.get("watcher") is not None:
+                evicted["watcher"].stop()
+    return run
+
 #returns all available scripts
 def get_scripts():
     scripts = []
@@ -98,13 +446,16 @@ def get_scripts():
             scripts.append(str(f)[:-3])
     return scripts
 
-app.layout = html.Div([
+#the layout is created for every page load, so every browser tab gets its own session id
+def serve_layout():
+    return html.Div([
+    dcc.Store(id='session', data=str(uuid.uuid4())),
     dbc.Tabs(
         [
             dbc.Tab(label='New Simulation', tab_id='new'),
             dbc.Tab(label='Simulation Results', tab_id='results'),
             dbc.Tab(label='Live Results', tab_id='live'),
-        ],
+        ] + ([dbc.Tab(label='Debug', tab_id='debug')] if debugPanel else []),
         id="tabs",
         active_tab="new"
     ),
@@ -115,146 +466,816 @@ app.layout = html.Div([
     html.Div(id='live_data', style={'display': 'none'})
 ])
 
-#load all dataframes from this simulation and store them in a dictionary
+app.layout = serve_layout
+
+#returns size and modification time of a log file, the cache of the file is invalid if they change
+def get_file_stamp(file):
+    stat = os.stat(file)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "version": cacheVersion}
+
+def get_cache_file(path, f, name):
+    return path + "/" + cacheDir + "/" + f + "." + name + "." + cacheFormat
+
+#write a file under a temporary name first, so readers never see a half written cache
+def write_frame(df, file):
+    tmpFile = file + ".tmp" + str(os.getpid())
+    if cacheFormat == "feather":
+        df.reset_index(drop=True).to_feather(tmpFile)
+    else:
+        df.to_pickle(tmpFile)
+    os.replace(tmpFile, file)
+
+def read_frame(file):
+    if cacheFormat == "feather":
+        return pd.read_feather(file)
+    return pd.read_pickle(file)
+
+#returns the cached frames of a log file or None if there is no valid cache
+def read_cached_frames(path, f, stamp, names = None):
+    try:
+        with open(path + "/" + cacheDir + "/" + f + ".json") as metaFile:
+            meta = json.load(metaFile)
+        if meta["stamp"] != stamp or meta["format"] != cacheFormat:
+            return None
+        return {name: read_frame(get_cache_file(path, f, name)) for name in meta["frames"] if names is None or name in names}
+    except (OSError, ValueError, KeyError, EOFError):
+        return None
+
+#store the parsed frames of a log file next to it, a read only log directory is not cached
+def write_cached_frames(path, f, stamp, frames):
+    try:
+        os.makedirs(path + "/" + cacheDir, exist_ok=True)
+        for name, df in frames.items():
+            write_frame(df, get_cache_file(path, f, name))
+        metaFile = path + "/" + cacheDir + "/" + f + ".json"
+        with open(metaFile + ".tmp" + str(os.getpid()), "w") as tmpFile:
+            json.dump({"stamp": stamp, "format": cacheFormat, "frames": list(frames)}, tmpFile)
+        os.replace(metaFile + ".tmp" + str(os.getpid()), metaFile)
+    except OSError:
+        pass
+
+def get_record_column(rows, col, dtype):
+    if col in recordDefaults:
+        values = rows[col].fillna(recordDefaults[col]) if col in rows else pd.Series(recordDefaults[col], index = rows.index)
+    else:
+        values = rows[col].fillna(-1) if dtype.startswith("int") else rows[col]
+    return values.astype(dtype).values
+
+#split the rows of a client log into one compact table per record type
+def split_records(df):
+    tables = {}
+    for name, table in recordTables.items():
+        rows = df[df[table["key"]].notna()]
+        tables[name] = pd.DataFrame({col: get_record_column(rows, col, dtype) for col, dtype in table["columns"].items()})
+    return tables
+
+#split binary log records into the same tables split_records returns for text logs
+def split_binary_records(records):
+    tables = {}
+    for name, table in recordTables.items():
+        rows = records[records["type"] == binaryRecords[name]["type"]]
+        tables[name] = pd.DataFrame({col: (rows[binaryRecords[name]["fields"][col]] / 1000000 if col in binaryMicroseconds else rows[binaryRecords[name]["fields"][col]]).astype(dtype)
+                                     for col, dtype in table["columns"].items()})
+    return tables
+
+#returns the complete records of a binary log, a partially written last record is ignored
+def read_binary_log(file):
+    with open(file, "rb") as log:
+        if log.read(len(binaryLogMagic)) != binaryLogMagic:
+            raise ValueError(file + " is not a binary client log")
+        data = log.read()
+    return np.frombuffer(data, binaryLogDtype, len(data) // binaryLogDtype.itemsize)
+
+#read the record tables of a client log, the log is only parsed if it changed since it was last cached
+def read_client_log(path, f, names = None):
+    stamp = get_file_stamp(path + "/" + f)
+    tables = read_cached_frames(path, f, stamp, names)
+    #counted in the process that reads the log, logs parsed in the ingest pool do not show up in the dashboard's metrics
+    metrics.cache("sidecar", tables is not None)
+    if tables is None:
+        with metrics.timer("parse_log"):
+            if f.endswith(".bin"):
+                tables = split_binary_records(read_binary_log(path + "/" + f))
+            else:
+                tables = split_records(pd.read_csv(path + "/" + f, sep = ";", dtype = clientLogDtypes))
+        metrics.count("log_bytes", stamp["size"])
+        metrics.count("log_rows", sum(len(table) for table in tables.values()))
+        write_cached_frames(path, f, stamp, tables)
+    return tables
+
+#returns true if f is an output file of a client of this simulation, either a text or a binary log
+def is_client_output(f, simId):
+    return str(f).startswith(simId) and not str(f).find('cl') == -1 and str(f).endswith(("output.txt", "output.bin"))
+
+#run func once for every tuple in args, in the process pool if there are enough calls
+def map_parallel(func, args):
+    global ingestPool
+    if ingestWorkers > 1 and len(args) >= parallelThreshold:
+        with ingestPoolLock:
+            if ingestPool is None:
+                ingestPool = ProcessPoolExecutor(max_workers = ingestWorkers)
+        return list(ingestPool.map(func, *zip(*args)))
+    return [func(*a) for a in args]
+
+#register the clients of this simulation, only their file names, algorithms and sizes are read
+#the logs are parsed by load_unit when a graph of a client is shown
+@metrics.timed("load_data")
 def load_data(path, simId):
     client_data.clear()
-    #get data for all clients
-    for f in list( listdir( path )):
-        if (str(f).startswith(simId) and not str(f).find('cl') == -1 and str(f).endswith("output.txt")):
-            # read dataframe for client if it is the first time accessing this data
-            if not str(f) in client_data:
-                cdata = pd.read_csv(path + "/" + str(f), sep = ";")
-                client_dict = {}
-                client_dict["df"] = cdata
-                client_data[str(f)] = client_dict
+    with unitMatricesLock:
+        get_bound_simulation()["matrices"].clear()
+    for entry in os.scandir(path):
+        if is_client_output(entry.name, simId):
+            client_data[entry.name] = {"path": path, "size": entry.stat().st_size, "algo": get_algo(entry.name)}
 
-def loadEventLog(path, simId):
+def read_event_log(path, simId):
     df = pd.read_csv(path + "/" + simId + "_event_log.txt" , sep = ";")
-    eventLog_data["BottleneckRate"] = df[df["Event"] == "BottleneckRate"] 
+    return df[df["Event"] == "BottleneckRate"]
 
-def load_unit(unit):
-    for c in client_data:
-        client_dict = client_data[c]
+def loadEventLog(path, simId):
+    eventLog_data["BottleneckRate"] = read_event_log(path, simId)
+
+#returns true if the packet rows of a table are throughput bins logged by the simulator
+def is_binned(table):
+    return "Bin_Duration" in table and len(table) > 0 and bool((table["Bin_Duration"] > 0).all())
+
+#spread the bytes of every throughput bin evenly over the time it covers
+#returns the seconds the bins cover and the bytes of every second, seconds between bins have 0 bytes
+def spread_bins(table):
+    starts = table["Time_Now"].values
+    ends = starts + table["Bin_Duration"].values
+    received = table["Bytes_Received"].values.astype("float64")
+    cumulative = np.cumsum(received)
+    #the bytes received up to any time are linear within a bin and flat between bins
+    x = np.maximum.accumulate(np.column_stack([starts, ends]).ravel())
+    y = np.column_stack([cumulative - received, cumulative]).ravel()
+    edges = np.arange(np.floor(starts[0]), np.ceil(x[-1]) + 1)
+    return edges[:-1].astype("int64"), np.diff(np.interp(edges, x, y))
+
+#extract the values of a unit from the record tables of a client
+def extract_client_unit(tables, unit):
+    table = tables[extract_unit[unit]["table"]]
+    df = pd.DataFrame({ extract_unit[unit]["index"]: pd.to_timedelta(table[extract_unit[unit]["index"]], unit = extract_unit[unit]["timeUnit"]),
+                        extract_unit[unit]["value"]: table[extract_unit[unit]["value"]] })
+    if unit == "tp" and is_binned(table):
+        #the simulator already summed the bytes of every bin, they only need to be spread over the seconds of the bin
+        seconds, received = spread_bins(table)
+        df = pd.DataFrame({extract_unit[unit]["value"]: received * 8 * 0.001}, index = pd.Index(seconds, name = extract_unit[unit]["index"]))
+    elif extract_unit[unit]["resample"]:
+        if unit == "tp":
+            df = df.resample('1S', on= extract_unit[unit]["index"]).sum()
+            df[extract_unit[unit]["value"]] = df[extract_unit[unit]["value"]] * 8 * 0.001
+        elif unit == "bul":
+            df = df.resample('1S', on= extract_unit[unit]["index"]).min()
+            df = df.ffill()
+        else:
+            df = df.resample('1S', on= extract_unit[unit]["index"]).mean()
+            df = df.ffill()
+        df.index = df.index.seconds
+    return df
+
+#returns a unit of a client from the sidecar cache, so all worker processes share it, the unit is extracted and cached if it is not there yet
+#tables are the record tables of the client if they are in memory already, otherwise they are read from the cache as well
+def extract_logged_unit(path, f, unit, tables = None):
+    stamp = get_file_stamp(path + "/" + f)
+    cached = read_cached_frames(path, f + "." + unit, stamp)
+    metrics.cache("unit_sidecar", cached is not None)
+    if cached is not None:
+        return cached[unit].set_index(extract_unit[unit]["index"])
+    if tables is None:
+        tables = read_client_log(path, f, [extract_unit[unit]["table"]])
+    df = extract_client_unit(tables, unit)
+    #the seconds are stored as a column, feather only keeps a default index
+    write_cached_frames(path, f + "." + unit, stamp, {unit: df.reset_index()})
+    return df
+
+#add a unit to these clients, all clients of the simulation if clients is None
+@metrics.timed("load_unit")
+def load_unit(unit, clients = None):
+    if unit == "eff":
+        return get_efficiency(clients)
+    clients = list(client_data) if clients is None else [str(c) for c in clients]
+    with get_bound_simulation()["unitLock"]:
+        missing = [c for c in clients if not unit in client_data[c]]
+        metrics.count("unit_loads", len(missing))
+        units = map_parallel(extract_logged_unit, [(client_data[c]["path"], c, unit) for c in missing])
+        for c, df in zip(missing, units):
+            client_data[c][unit] = df
+
+#load what is likely shown next in the background: the other units of the selected clients and the shown units of the clients after them
+#without a selection the first clients are loaded, a newer prefetch of the same simulation cancels the rest of an older one
+def prefetch(clients, units):
+    sim = get_bound_simulation()
+    if prefetchClients <= 0 or sim["key"] is None:
+        return
+    clients = [str(c) for c in clients]
+    order = sorted(client_data, key = cmp_to_key(cmp_clients))
+    start = max(order.index(c) for c in clients) + 1 if clients else 0
+    following = [c for c in order[start:] if not c in clients][:prefetchClients]
+    jobs = [(unit, clients) for unit in prefetchUnits if clients and not unit in units] + [(unit, following) for unit in units if following]
+    with prefetchLock:
+        sim["prefetch"] += 1
+        generation = sim["prefetch"]
+    prefetchPool.submit(run_prefetch, sim, generation, jobs)
+
+def run_prefetch(sim, generation, jobs):
+    boundSimulation.sim = sim
+    for unit, clients in jobs:
+        if sim["prefetch"] != generation:
+            return
+        with metrics.timer("prefetch"):
+            load_unit(unit, clients)
+
+
+
+
+#parse the records that were appended to a growing log since the last call, returns their tables or None if there are none
+#client_dict keeps the byte offset of the first unread record, a partially written last record is left for the next call
+def read_new_records(file, client_dict):
+    with open(file, "rb") as log:
+        log.seek(client_dict["offset"])
+        chunk = log.read()
+    metrics.count("live_bytes", len(chunk))
+    if file.endswith(".bin"):
+        return read_new_binary_records(chunk, client_dict)
+    end = chunk.rfind(b"\n") + 1
+    start = 0
+    if not "columns" in client_dict and end > 0:
+        start = chunk.find(b"\n") + 1
+        client_dict["columns"] = chunk[:start].decode().strip().split(";")
+    client_dict["offset"] += end
+    if end <= start:
+        return None
+    return split_records(pd.read_csv(io.BytesIO(chunk[start:end]), sep = ";", header = None, names = client_dict["columns"], dtype = clientLogDtypes))
+
+def read_new_binary_records(chunk, client_dict):
+    start = 0
+    if client_dict["offset"] == 0:
+        if len(chunk) < len(binaryLogMagic):
+            return None
+        start = len(binaryLogMagic)
+    count = (len(chunk) - start) // binaryLogDtype.itemsize
+    client_dict["offset"] += start + count * binaryLogDtype.itemsize
+    if count == 0:
+        return None
+    return split_binary_records(np.frombuffer(chunk, binaryLogDtype, count, start))
+
+#append only storage for a live series, every column is a numpy array that grows by doubling
+#with a window, rows whose index is more than window smaller than the newest index are dropped
+#total counts all rows ever appended, also the dropped ones, so readers can tell which rows they have not seen yet
+class ColumnBuffer(object):
+    def __init__(self, columns, index, window = None, capacity = 1024):
+        self.index = index
+        self.window = window
+        self.data = {col: np.empty(capacity, dtype) for col, dtype in columns.items()}
+        self.start = 0
+        self.end = 0
+        self.total = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    #returns the rows of a column without copying them, appending never changes a returned view
+    def view(self, col):
+        return self.data[col][self.start:self.end]
+
+    #views of all columns taken at the same time
+    def columns(self):
+        return {col: self.view(col) for col in self.data}
+
+    #move the rows into new arrays with room for at least as many rows again
+    def reserve(self, n):
+        size = len(self) + n
+        capacity = max(len(self.data[self.index]), 2 * size)
+        for col, arr in self.data.items():
+            moved = np.empty(capacity, arr.dtype)
+            moved[:len(self)] = arr[self.start:self.end]
+            self.data[col] = moved
+        self.end = len(self)
+        self.start = 0
+
+    def append(self, values):
+        n = len(values[self.index])
+        if n == 0:
+            return
+        if self.end + n > len(self.data[self.index]):
+            self.reserve(n)
+        for col, arr in self.data.items():
+            arr[self.end:self.end + n] = values[col]
+        self.end += n
+        self.total += n
+        if self.window is not None:
+            index = self.view(self.index)
+            self.start += int(np.searchsorted(index, index[-1] - self.window, side = "left"))
+
+#sums a live series into one second bins across chunks
+#the newest bin stays open because later chunks can still add to it, rows of already emitted seconds are added to the open bin
+class SecondBinner(object):
+    def __init__(self):
+        self.second = None
+        self.total = 0.0
+        self.closed = False
+
+    #returns seconds and sums of the bins closed by these rows, rows pushed after flush are dropped
+    def push(self, times, values):
+        if len(times) == 0 or self.closed:
+            return np.empty(0, "int64"), np.empty(0, "float64")
+        seconds = np.floor(times).astype("int64")
+        first = self.second if self.second is not None else seconds.min()
+        sums = np.bincount(np.maximum(seconds, first) - first, weights = values)
+        sums[0] += self.total
+        self.second = first + len(sums) - 1
+        self.total = sums[-1]
+        return np.arange(first, self.second, dtype = "int64"), sums[:-1]
+
+    #returns the open bin as a closed one and closes the binner, later calls return nothing
+    def flush(self):
+        if self.second is None or self.closed:
+            self.closed = True
+            return np.empty(0, "int64"), np.empty(0, "float64")
+        self.closed = True
+        return np.array([self.second], "int64"), np.array([self.total], "float64")
+
+#append the records of a newly read chunk to the live series of a client
+def append_live_units(client_dict, tables):
+    for unit, spec in live_extract_unit.items():
+        table = tables[spec["table"]]
+        if spec["resample"]:
+            if not unit + "_bins" in client_dict:
+                client_dict[unit + "_bins"] = SecondBinner()
+            times, received = table[spec["index"]].values, table[spec["value"]].values
+            if is_binned(table):
+                #a bin can cover parts of seconds that the next chunk continues, its seconds go through the binner like packets
+                times, received = spread_bins(table)
+            seconds, sums = client_dict[unit + "_bins"].push(times, received)
+            values = { spec["index"]: seconds, spec["value"]: sums * 8 * 0.001 }
+        else:
+            values = { spec["index"]: table[spec["index"]].values, spec["value"]: table[spec["value"]].values }
         if not unit in client_dict:
-            df = client_dict["df"].copy()
-            df = df[[ extract_unit[unit]["index"], extract_unit[unit]["value"] ]].dropna()
-            df[extract_unit[unit]["index"]] = pd.to_timedelta(df[extract_unit[unit]["index"]], unit = extract_unit[unit]["timeUnit"])
-            if extract_unit[unit]["resample"]:
-                if unit == "tp":
-                    df = df.resample('1S', on= extract_unit[unit]["index"]).sum()
-                    df[extract_unit[unit]["value"]] = df[extract_unit[unit]["value"]] * 8 * 0.001
-                elif unit == "bul":
-                    df = df.resample('1S', on= extract_unit[unit]["index"]).min()
-                    df = df.ffill()
-                else:
-                    df = df.resample('1S', on= extract_unit[unit]["index"]).mean()
-                    df = df.ffill()
-                df.index = df.index.seconds
-            client_dict[unit] = df
-            client_data[c] = client_dict
-
-
-
-
-#update the dataframes from the currently running simulation    
-def new_load_live_data(path, simId, unit):
-    app_state["loading"] = True
-    #get data for all clients
-    for f in list( listdir( path )):
-        if (str(f).startswith(simId) and not str(f).find('cl') == -1 and str(f).endswith("output.txt")):
+            client_dict[unit] = ColumnBuffer({col: arr.dtype for col, arr in values.items()}, spec["index"], liveWindow)
+        client_dict[unit].append(values)
+
+#append the open bins of a client to its live series, the last second of a run is only closed by this
+def flush_live_units(client_dict):
+    for unit, spec in live_extract_unit.items():
+        if unit + "_bins" in client_dict:
+            seconds, sums = client_dict[unit + "_bins"].flush()
+            if len(seconds):
+                client_dict[unit].append({ spec["index"]: seconds, spec["value"]: sums * 8 * 0.001 })
+
+#read the rest of the logs of a run whose simulation exited and close the open bins of its clients
+#a run that no page watched is not in liveRuns and is left alone
+def finish_live_run(path, simId):
+    with liveRunsLock:
+        run = liveRuns.get((path, simId))
+    if run is None:
+        return
+    if run.get("watcher") is not None:
+        #the watcher might not have seen the last writes yet
+        run["watcher"].mark(run["watcher"].scan())
+    liveLoads.do((path, simId), lambda: new_load_live_data(path, simId))
+    with run["lock"]:
+        for client_dict in run["clients"].values():
+            flush_live_units(client_dict)
+
+#update the live series of a running simulation, returns its live run
+#call it through liveLoads so only one thread reads the logs of a run at a time
+#only the client logs the watcher of the run saw changing are read
+@metrics.timed("live_load")
+def new_load_live_data(path, simId):
+    run = get_live_run(path, simId)
+    if run.get("watcher") is None:
+        run["watcher"] = RunWatcher(path)
+    for f in run["watcher"].take_changes():
+        if is_client_output(f, simId):
             #read new data logs
-            if not str(f) in live_client_data:
-                cdata = pd.read_csv(path + "/" + str(f), sep = ";")
-                client_dict = {}
-                client_dict["lastRead"] = len(cdata.index)
-                client_dict["df"] = cdata
-                live_client_data[str(f)] = client_dict
-            else:
-                client_dict = live_client_data[str(f)]
-                cdata = pd.read_csv(path + "/" + str(f), sep = ";", skiprows=range(1, client_dict["lastRead"]))
-                client_dict["df"] = client_dict["df"].append(cdata)
-                client_dict["lastRead"] = client_dict["lastRead"] + len(cdata.index)
-
-            if not unit + "_lastRead" in client_dict:
-                df = client_dict["df"].copy()
-                client_dict[unit +"_lastRead"] = len(df)
-                df = df[[ live_extract_unit[unit]["index"], live_extract_unit[unit]["value"] ]].dropna()
-                df[live_extract_unit[unit]["index"]] = pd.to_timedelta(df[live_extract_unit[unit]["index"]], unit = live_extract_unit[unit]["timeUnit"])
-                if  live_extract_unit[unit]["resample"]:
-                    df = df.resample('1S', on= live_extract_unit[unit]["index"]).sum() 
-                    if not df.empty:
-                        df.index = df.index.seconds
-                        df[live_extract_unit[unit]["value"]] = df[live_extract_unit[unit]["value"]] * 8 * 0.001
-                client_dict[unit] = df
-                
-            else:
-                lastRead = client_dict[unit +"_lastRead"]
-                df = client_dict["df"][lastRead:].copy()
-                df = df[[ live_extract_unit[unit]["index"], live_extract_unit[unit]["value"] ]].dropna()
-                df[live_extract_unit[unit]["index"]] = pd.to_timedelta(df[live_extract_unit[unit]["index"]], unit = live_extract_unit[unit]["timeUnit"])
-                if live_extract_unit[unit]["resample"]:
-                    df = df.resample('1S', on= live_extract_unit[unit]["index"]).sum()
-                    if not df.empty:
-                        df.index = df.index.seconds
-                        df[live_extract_unit[unit]["value"]] = df[live_extract_unit[unit]["value"]] * 8 * 0.001
-                new_df = client_dict[unit].append(df)
-                client_dict[unit] = new_df
-                client_dict[unit +"_lastRead"] = len(client_dict["df"].index)
-            
-            
-    app_state["loading"] = False
-
-                    
-                    
-        
-
-#get the average of all dataframes
-def get_average(dfs):
-    avg = reduce(lambda a, b: a.add(b, fill_value=0), dfs)
-    avg = avg.div(len(dfs))
-    return avg
-
-#get the sum of all dataframes
-def get_sum(dfs):
-    res = reduce(lambda a, b: a.add(b, fill_value=0), dfs)
-    return res
-
-#sum up all values of the first column of a dataframe
-def get_col_sum(df, col):
-    return df[col].sum()
-
-#sum up all values of the first column of a dataframe
-def get_col_avg(df, col):
-    return df[col].mean()
-
-#count the changes in the first column of a dataframe
-def count_changes(df):
-    changes = (df.diff(axis=0) != 0).sum(axis=0)
-    return changes[0] - 1 #Don't count first change in quality
+            with run["lock"]:
+                if not str(f) in run["clients"]:
+                    run["clients"][str(f)] = {"offset": 0}
+                client_dict = run["clients"][str(f)]
+            tables = read_new_records(path + "/" + str(f), client_dict)
+            if tables is not None:
+                with run["lock"]:
+                    append_live_units(client_dict, tables)
+    return run
+
+#views of the live series of all clients of a run and their total row counts, taken while no chunk is appended
+def get_live_series(run):
+    with run["lock"]:
+        return {f: {unit: {"total": client_dict[unit].total, "columns": client_dict[unit].columns()} for unit in live_extract_unit if unit in client_dict}
+                for f, client_dict in run["clients"].items()}
+
+#align the frames of a unit on the union of their seconds, labels are the client files of the frames
+#"values" has one row per client with NaN where a client has no value, "present" marks the seconds a client has a row for
+@metrics.timed("build_unit_matrix")
+def build_unit_matrix(unit, labels, frames):
+    index = np.unique(np.concatenate([df.index.values for df in frames])) if frames else np.empty(0)
+    values = np.full((len(labels), len(index)), np.nan)
+    present = np.zeros((len(labels), len(index)), dtype = bool)
+    for row, df in enumerate(frames):
+        cols = np.searchsorted(index, df.index.values)
+        values[row, cols] = df[extract_unit[unit]["value"]].values
+        present[row, cols] = True
+    return {"rows": {c: row for row, c in enumerate(labels)}, "algos": np.array([get_algo(c) for c in labels]),
+            "sims": np.array([get_sim_id(c) for c in labels]), "index": index, "values": values, "present": present}
+
+#returns a matrix of a unit that has a row for each of these clients of the loaded simulation
+#the matrix is rebuilt with the rows of the clients that are missing in it, so it grows with the clients that were selected
+def get_unit_matrix(unit, clients):
+    clients = [str(c) for c in clients]
+    unitMatrices = get_bound_simulation()["matrices"]
+    with unitMatricesLock:
+        matrix = unitMatrices.get(unit)
+        metrics.cache("unit_matrix", matrix is not None and all(c in matrix["rows"] for c in clients))
+        if matrix is not None and all(c in matrix["rows"] for c in clients):
+            return matrix
+    load_unit(unit, clients)
+    clients = [c for c in client_data if unit in client_data[c]]
+    matrix = build_unit_matrix(unit, clients, [client_data[c][unit] for c in clients])
+    with unitMatricesLock:
+        unitMatrices[unit] = matrix
+    return matrix
+
+#settings of a run that are kept in simN_config.json, replications of a configuration differ only in their seed
+#returns the settings without the seed or None if the run has no config file
+def read_run_config(runDir, simId):
+    try:
+        with open(runDir + "/" + simId + "_config.json") as configFile:
+            config = json.load(configFile)
+    except (OSError, ValueError):
+        return None
+    for key in ["seed", "RngRun"]:
+        config.pop(key, None)
+    return config
+
+#returns the ids of the other runs in the directory of a run that have the same config, none if the run has no config file
+def get_replication_simIds(simName, nrClients, simId):
+    runDir = path + simName + "/" + nrClients
+    config = read_run_config(runDir, simId)
+    if config is None:
+        return []
+    return [other for other in get_indexed_simIds(simName, nrClients) if other != simId and read_run_config(runDir, other) == config]
+
+#returns the frames of a unit for the clients of the other runs of the loaded configuration that have the same number and algorithm as these clients, keyed by client file
+@metrics.timed("load_replications")
+def load_replications(unit, clients):
+    simName, nrClients, simId = get_bound_simulation()["key"]
+    runDir = path + simName + "/" + nrClients
+    names = set(trim_client(str(c)) for c in clients)
+    frames = OrderedDict()
+    for other in get_replication_simIds(simName, nrClients, simId):
+        files = [f for f in get_indexed_outputs(simName, nrClients, other) if trim_client(f) in names]
+        if not files:
+            continue
+        if unit == "eff":
+            dfs = compute_efficiency(map_parallel(extract_logged_unit, [(runDir, f, "tp") for f in files]), read_event_log(runDir, other))
+        else:
+            dfs = map_parallel(extract_logged_unit, [(runDir, f, unit) for f in files])
+        frames.update(zip(files, dfs))
+    return frames
+
+#returns the matrix of a unit for these clients and their replications in the runs with the same config as the loaded one
+#like get_unit_matrix it is rebuilt when clients are selected that it has no rows for
+def get_replication_matrix(unit, clients):
+    clients = [str(c) for c in clients]
+    unitMatrices = get_bound_simulation()["matrices"]
+    with unitMatricesLock:
+        matrix = unitMatrices.get(("replications", unit))
+        if matrix is not None and all(c in matrix["rows"] for c in clients):
+            return matrix
+        if matrix is not None:
+            clients = [c for c in client_data if c in matrix["rows"] and not c in clients] + clients
+    load_unit(unit, clients)
+    frames = OrderedDict((c, client_data[c][unit]) for c in clients)
+    frames.update(load_replications(unit, clients))
+    matrix = build_unit_matrix(unit, list(frames), list(frames.values()))
+    with unitMatricesLock:
+        unitMatrices[("replications", unit)] = matrix
+    return matrix
+
+#sum or average of a unit over some clients, like adding their frames with fill_value=0
+#returns the seconds any of the clients has and the aggregated value, NaN where all of them are NaN
+def aggregate_clients(matrix, rows, aggregation):
+    cols = matrix["present"][rows].any(axis = 0)
+    values = matrix["values"][rows][:, cols]
+    result = np.nansum(values, axis = 0)
+    result[np.isnan(values).all(axis = 0)] = np.nan
+    if aggregation == 'avg':
+        result = result / len(rows)
+    return matrix["index"][cols], result
+
+#percentiles of a unit over some clients for every second any of them has a value
+def percentile_band(matrix, rows):
+    values = matrix["values"][rows]
+    cols = ~np.isnan(values).all(axis = 0)
+    if len(rows) == 0 or not cols.any():
+        return np.empty(0), np.empty((len(bandPercentiles), 0))
+    return matrix["index"][cols], np.nanpercentile(values[:, cols], bandPercentiles, axis = 0)
+
+#mean of a unit over some clients and its bootstrap confidence interval for every second any of them has a value
+#whole runs are resampled if the rows come from several runs, single clients otherwise
+#every resample is a row of multinomial weights, so all resamples are one matrix product
+@metrics.timed("bootstrap_ci")
+def bootstrap_ci(matrix, rows):
+    values = matrix["values"][rows]
+    cols = ~np.isnan(values).all(axis = 0)
+    #no clients or no values, e.g. an empty selection
+    if len(rows) == 0 or not cols.any():
+        return np.empty(0), np.empty(0), np.empty(0), np.empty(0)
+    values = values[:, cols]
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0)
+    sims, unitOf = np.unique(matrix["sims"][rows], return_inverse = True)
+    if len(sims) < 2:
+        unitOf = np.arange(len(rows))
+    nUnits = unitOf.max() + 1
+    counts = np.random.default_rng(0).multinomial(nUnits, np.full(nUnits, 1.0 / nUnits), size = bootstrapSamples)
+    #float operands keep both products in BLAS
+    weights = counts[:, unitOf].astype("float64")
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        means = (weights @ filled) / (weights @ valid.astype("float64"))
+    #a resample can miss all values of a second, nanpercentile is much slower and only needed then
+    percentile = np.nanpercentile if np.isnan(means).any() else np.percentile
+    lower, upper = percentile(means, [50 * (1 - ciLevel), 50 * (1 + ciLevel)], axis = 0)
+    return matrix["index"][cols], filled.sum(axis = 0) / valid.sum(axis = 0), lower, upper
+
+#rows of the replication matrix that belong to these clients, the clients themselves and the clients with the same number and algorithm in the other runs
+def replication_clients(matrix, clients):
+    order = {trim_client(str(c)): i for i, c in enumerate(clients)}
+    return sorted([label for label in matrix["rows"] if trim_client(label) in order], key = lambda label: order[trim_client(label)])
+
+#color of a band, plotly colors are hex strings
+def band_color(color, alpha):
+    return "rgba(" + ", ".join(str(int(color[i:i + 2], 16)) for i in (1, 3, 5)) + ", " + str(alpha) + ")"
+
+#rows of the matrix for these clients grouped by their abr algorithm, in the order the algorithms first appear
+def group_by_algo(matrix, clients):
+    groups = OrderedDict()
+    for client in clients:
+        groups.setdefault(get_algo(client), []).append(matrix["rows"][str(client)])
+    return groups
 
 def get_algo(client):
-    result = re.search('cl\d+_(.*)_output.txt', client)
+    result = re.search('cl\d+_(.*)_output\.(txt|bin)', client)
     return result.group(1)
 
-def get_efficiency():
-    load_unit('tp')
-    for c in client_data:
-        client_dict = client_data[c]
-        if not "eff" in client_dict:
-            bottleneck_rates = eventLog_data["BottleneckRate"]
-            efficiency = client_dict["tp"].copy()
-            for i in range(len(bottleneck_rates)):
-                current_rate = bottleneck_rates.iloc[i]["Value"]
-                if i == len(bottleneck_rates) -1:
-                    eff = efficiency.loc[ efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"], "Bytes_Received" ].div(current_rate)
-                    efficiency.loc[ efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"], "Bytes_Received" ] = eff
-                else:
-                    eff = efficiency.loc[ (efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"]) & (efficiency.index < bottleneck_rates.iloc[i + 1]["Time_Now"]), "Bytes_Received" ].div(current_rate)
-                    efficiency.loc[ (efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"]) & (efficiency.index < bottleneck_rates.iloc[i + 1]["Time_Now"]), "Bytes_Received" ] = eff
-            client_dict["eff"] = efficiency
-            client_data[c] = client_dict
+#divide the throughput of every second by the bottleneck rate that was set at this time, returns one frame per throughput frame
+def compute_efficiency(tps, bottleneck_rates):
+    bottleneck_rates = bottleneck_rates[["Time_Now", "Value"]].astype("float64").sort_values("Time_Now", kind = "mergesort")
+    #one as-of join of the seconds of all clients against the rate changes
+    throughput = pd.concat(tps, keys = range(len(tps)), names = ["Client", "Second"]).reset_index()
+    throughput["Time"] = throughput["Second"].astype("float64")
+    throughput = pd.merge_asof(throughput.sort_values("Time", kind = "mergesort"), bottleneck_rates, left_on = "Time", right_on = "Time_Now")
+    #seconds before the first rate change are left as they are
+    throughput["Bytes_Received"] = throughput["Bytes_Received"].div(throughput["Value"]).fillna(throughput["Bytes_Received"])
+    groups = dict(list(throughput.groupby("Client", sort = True)))
+    efficiencies = []
+    #a client without throughput has no group, it gets an empty frame so the result still lines up with tps
+    for i, tp in enumerate(tps):
+        if i in groups:
+            efficiency = groups[i].set_index("Second")[["Bytes_Received"]]
+            efficiency.index.name = tp.index.name
+        else:
+            efficiency = tp[["Bytes_Received"]].astype("float64")
+        efficiencies.append(efficiency)
+    return efficiencies
+
+#add the efficiency to these clients, all clients of the simulation if clients is None
+@metrics.timed("get_efficiency")
+def get_efficiency(clients = None):
+    clients = list(client_data) if clients is None else [str(c) for c in clients]
+    with get_bound_simulation()["unitLock"]:
+        missing = [c for c in clients if not "eff" in client_data[c]]
+        if not missing:
+            return
+        load_unit('tp', missing)
+        for c, efficiency in zip(missing, compute_efficiency([client_data[c]["tp"] for c in missing], eventLog_data["BottleneckRate"])):
+            client_data[c]["eff"] = efficiency
+
+#times and values of the bottleneck rate changes of the event log, sorted by time
+def get_rate_changes(bottleneck_rates):
+    bottleneck_rates = bottleneck_rates[["Time_Now", "Value"]].astype("float64").sort_values("Time_Now", kind = "mergesort")
+    return bottleneck_rates["Time_Now"].values, bottleneck_rates["Value"].values
+
+#all scalar metrics of a client in one pass over its record tables, metrics a client has no records for are NaN
+#quality changes are counted on the decisions, a stall starts with an underrun record of 1 and ends with the next record of 0
+def compute_client_kpis(tables, rateTimes, rateValues):
+    kpis = dict.fromkeys(indexedKpis, np.nan)
+    packets = tables["packets"]
+    #the last packet arrived at the end of the last bin if the simulator logged bins
+    packetEnd = packets["Time_Now"].values + (packets["Bin_Duration"].values if is_binned(packets) else 0)
+    lastTimes = [tables[name]["Time_Now"].values[-1] for name in kpiTables if name != "packets" and len(tables[name])] + list(packetEnd[-1:])
+    if not lastTimes:
+        return kpis
+    end = max(lastTimes)
+    decisionTimes = tables["decisions"]["Time_Now"].values
+    levels = tables["decisions"]["Rep_Level"].values.astype("float64")
+    if len(levels):
+        steps = np.abs(np.diff(levels))
+        steps = steps[steps != 0]
+        kpis["qualChanges"] = len(steps)
+        kpis["qualChangeMagnitude"] = steps.mean() if len(steps) else 0.0
+        kpis["meanQuality"] = levels.mean()
+        #every decision holds until the next one, the last one until the last packet of its segment arrived
+        downloadEnd = packetEnd.max() if len(packetEnd) else decisionTimes[-1]
+        durations = np.diff(np.append(decisionTimes, max(downloadEnd, decisionTimes[-1])))
+        kpis["avgQuality"] = (levels * durations).sum() / durations.sum() if durations.sum() > 0 else levels.mean()
+    flags = tables["underruns"]["Buffer_Underrun"].values
+    underrunTimes = tables["underruns"]["Time_Now"].values
+    starts = np.flatnonzero((flags == 1) & (np.concatenate([[0], flags[:-1]]) != 1))
+    resumes = np.flatnonzero(flags == 0)
+    #a stall that is still going on lasts until the end of the log
+    stallEnds = np.append(underrunTimes[resumes], end)[np.minimum(np.searchsorted(resumes, starts), len(resumes))]
+    kpis["stalls"] = len(starts)
+    kpis["bufferUnderruns"] = (stallEnds - underrunTimes[starts]).sum()
+    if len(tables["playback"]) and len(decisionTimes):
+        kpis["startupDelay"] = tables["playback"]["Time_Now"].values[0] - decisionTimes[0]
+    if len(packets):
+        #the same seconds and rates as the eff unit, resampled seconds start at the first packet and bins of the simulator are spread over their seconds
+        #seconds before the first rate change are not divided
+        if is_binned(packets):
+            seconds, received = spread_bins(packets)
+            kb = received * 8 * 0.001
+            first = seconds[0]
+        else:
+            times = packets["Time_Now"].values
+            kb = np.bincount(np.floor(times - times.min()).astype("int64"), weights = packets["Bytes_Received"].values.astype("float64")) * 8 * 0.001
+            first = np.floor(times.min())
+        changes = np.searchsorted(rateTimes, np.arange(len(kb)) + first, side = "right") - 1
+        rates = np.where(changes >= 0, rateValues[np.maximum(changes, 0)] if len(rateValues) else 1.0, 1.0)
+        kpis["avgEff"] = (kb / rates).mean()
+    return {k: float(v) for k, v in kpis.items()}
+
+#the metrics of a client log, only the tables the metrics need are read
+def client_kpis(path, f, rateTimes, rateValues):
+    return compute_client_kpis(read_client_log(path, f, kpiTables), rateTimes, rateValues)
+
+#add the scalar metrics to these clients, one pass over the records of every client computes all of them
+#the metrics of indexed runs are already set by load_indexed_kpis
+@metrics.timed("load_kpis")
+def load_kpis(clients):
+    missing = [str(c) for c in clients if not all(k in client_data[str(c)] for k in indexedKpis)]
+    metrics.count("kpi_passes", len(missing))
+    if not missing:
+        return
+    rateTimes, rateValues = get_rate_changes(eventLog_data["BottleneckRate"])
+    for c, kpis in zip(missing, map_parallel(client_kpis, [(client_data[c]["path"], c, rateTimes, rateValues) for c in missing])):
+        client_data[c].update(kpis)
+
+def setup_index(connection):
+    connection.execute("CREATE TABLE IF NOT EXISTS dirs (dir TEXT PRIMARY KEY, mtime INTEGER)")
+    connection.execute("CREATE TABLE IF NOT EXISTS runs (simName TEXT, nrClients TEXT, simId TEXT, indexed INTEGER, PRIMARY KEY (simName, nrClients, simId))")
+    connection.execute("CREATE TABLE IF NOT EXISTS files (simName TEXT, nrClients TEXT, simId TEXT, file TEXT, size INTEGER, mtime INTEGER, PRIMARY KEY (simName, nrClients, simId, file))")
+    connection.execute("CREATE TABLE IF NOT EXISTS sessions (sessionId TEXT PRIMARY KEY, simName TEXT, nrClients TEXT, simId TEXT, updated REAL)")
+    connection.execute("CREATE TABLE IF NOT EXISTS session_state (sessionId TEXT PRIMARY KEY, state TEXT, updated REAL)")
+    #an index written before a metric was added or changed is dropped, its runs are indexed again
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(clients)")]
+    if columns and (any(not k in columns for k in indexedKpis) or connection.execute("PRAGMA user_version").fetchone()[0] != kpiVersion):
+        connection.execute("DROP TABLE clients")
+        connection.execute("UPDATE runs SET indexed = 0")
+    connection.execute("PRAGMA user_version = " + str(kpiVersion))
+    connection.execute("CREATE TABLE IF NOT EXISTS clients (simName TEXT, nrClients TEXT, simId TEXT, file TEXT, clientNr INTEGER, algorithm TEXT, "
+                       + ", ".join(k + " REAL" for k in indexedKpis) + ", PRIMARY KEY (simName, nrClients, simId, file))")
+    connection.commit()
+
+#yields a connection to the summary index, the block is one transaction and the connection is closed when it ends
+#the tables are set up by the first connection of the process
+@contextmanager
+def open_index():
+    connection = sqlite3.connect(indexFile, timeout = 30)
+    try:
+        with indexSchemasLock:
+            if not indexFile in indexSchemas:
+                setup_index(connection)
+                indexSchemas.add(indexFile)
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+#register the files of all runs in the index, only directories whose content changed since the last scan are listed again
+@metrics.timed("scan_runs")
+def scan_runs():
+    with open_index() as connection:
+        knownDirs = dict(connection.execute("SELECT dir, mtime FROM dirs"))
+        for simName in listdir(path):
+            if not os.path.isdir(path + simName):
+                continue
+            for nrClients in listdir(path + simName):
+                runDir = path + simName + "/" + nrClients
+                if not os.path.isdir(runDir) or knownDirs.get(runDir) == os.stat(runDir).st_mtime_ns:
+                    continue
+                runs = {}
+                for f in listdir(runDir):
+                    if get_sim_id(f) != -1:
+                        runs.setdefault(get_sim_id(f), []).append(f)
+                for simId, files in runs.items():
+                    register_run(connection, simName, nrClients, simId, files)
+                for (simId,) in connection.execute("SELECT simId FROM runs WHERE simName = ? AND nrClients = ?", (simName, nrClients)).fetchall():
+                    if not simId in runs:
+                        remove_run(connection, simName, nrClients, simId)
+                connection.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (runDir, os.stat(runDir).st_mtime_ns))
+        #forget runs whose directory was deleted
+        for simName, nrClients, simId in connection.execute("SELECT simName, nrClients, simId FROM runs").fetchall():
+            if not os.path.isdir(path + simName + "/" + nrClients):
+                remove_run(connection, simName, nrClients, simId)
+                connection.execute("DELETE FROM dirs WHERE dir = ?", (path + simName + "/" + nrClients,))
+
+def remove_run(connection, simName, nrClients, simId):
+    for table in ["runs", "files", "clients"]:
+        connection.execute("DELETE FROM " + table + " WHERE simName = ? AND nrClients = ? AND simId = ?", (simName, nrClients, simId))
+
+#store the files of a run, the metrics of the run are dropped if any of its files changed
+def register_run(connection, simName, nrClients, simId, files):
+    runDir = path + simName + "/" + nrClients + "/"
+    stamps = set((f, os.stat(runDir + f).st_size, os.stat(runDir + f).st_mtime_ns) for f in files)
+    key = (simName, nrClients, simId)
+    if stamps == set(connection.execute("SELECT file, size, mtime FROM files WHERE simName = ? AND nrClients = ? AND simId = ?", key)):
+        return False
+    connection.execute("DELETE FROM files WHERE simName = ? AND nrClients = ? AND simId = ?", key)
+    connection.execute("DELETE FROM clients WHERE simName = ? AND nrClients = ? AND simId = ?", key)
+    connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", [key + stamp for stamp in stamps])
+    connection.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, 0)", key)
+    return True
+
+#store the metrics of the clients of a run
+def store_run_kpis(connection, simName, nrClients, simId, kpis):
+    key = (simName, nrClients, simId)
+    connection.execute("DELETE FROM clients WHERE simName = ? AND nrClients = ? AND simId = ?", key)
+    connection.executemany("INSERT INTO clients VALUES (?, ?, ?, ?, ?, ?, " + ", ".join("?" for k in indexedKpis) + ")",
+                           [key + (c, get_client_nr(c), get_algo(c)) + tuple(values[k] for k in indexedKpis) for c, values in kpis.items()])
+    connection.execute("UPDATE runs SET indexed = 1 WHERE simName = ? AND nrClients = ? AND simId = ?", key)
+
+#compute and store the metrics of a finished run without touching the loaded simulation
+@metrics.timed("index_run")
+def index_run(simName, nrClients, simId):
+    runDir = path + simName + "/" + nrClients
+    files = [str(f) for f in listdir(runDir) if get_sim_id(f) == simId]
+    clients = [f for f in files if is_client_output(f, simId)]
+    rateTimes, rateValues = get_rate_changes(read_event_log(runDir, simId))
+    kpis = map_parallel(client_kpis, [(runDir, c, rateTimes, rateValues) for c in clients])
+    with open_index() as connection:
+        register_run(connection, simName, nrClients, simId, files)
+        store_run_kpis(connection, simName, nrClients, simId, dict(zip(clients, kpis)))
+
+#copy the indexed metrics of the loaded run into client_data
+#a run that is not indexed yet is indexed in indexPool, until then the graphs compute the metrics of the clients they show
+def load_indexed_kpis(simName, nrClients, simId):
+    runDir = path + simName + "/" + nrClients
+    with open_index() as connection:
+        register_run(connection, simName, nrClients, simId, [str(f) for f in listdir(runDir) if get_sim_id(f) == simId])
+        rows = connection.execute("SELECT file, " + ", ".join(indexedKpis) + " FROM clients WHERE simName = ? AND nrClients = ? AND simId = ?",
+                                  (simName, nrClients, simId)).fetchall()
+        if rows:
+            for row in rows:
+                if row[0] in client_data:
+                    client_data[row[0]].update(zip(indexedKpis, row[1:]))
+            return
+    queue_index_run(simName, nrClients, simId)
+
+#index a run in indexPool, unless it is already queued or being indexed
+def queue_index_run(simName, nrClients, simId):
+    key = (simName, nrClients, simId)
+    with indexingRunsLock:
+        if key in indexingRuns:
+            return
+        indexingRuns.add(key)
+    indexPool.submit(run_queued_index, key)
+
+def run_queued_index(key):
+    try:
+        index_run(*key)
+    except Exception as e:
+        print("indexing " + "/".join(key) + " failed: " + str(e))
+    finally:
+        with indexingRunsLock:
+            indexingRuns.discard(key)
+
+def get_indexed_simulations():
+    with open_index() as connection:
+        return [row[0] for row in connection.execute("SELECT DISTINCT simName FROM runs ORDER BY simName")]
+
+def get_indexed_nrClients(simName):
+    with open_index() as connection:
+        return sorted([row[0] for row in connection.execute("SELECT DISTINCT nrClients FROM runs WHERE simName = ?", (simName,))], key = int)
+
+def get_indexed_simIds(simName, nrClients):
+    with open_index() as connection:
+        simIds = [row[0] for row in connection.execute("SELECT simId FROM runs WHERE simName = ? AND nrClients = ?", (simName, nrClients))]
+    return sorted(simIds, key = get_sim_nr)
+
+#returns the client output files of a run from the index
+def get_indexed_outputs(simName, nrClients, simId):
+    with open_index() as connection:
+        outputs = [row[0] for row in connection.execute("SELECT file FROM files WHERE simName = ? AND nrClients = ? AND simId = ?", (simName, nrClients, simId))]
+    outputs = [f for f in outputs if is_client_output(f, simId)]
+    outputs.sort(key = cmp_to_key(cmp_clients))
+    return outputs
     
+@metrics.timed("refresh_simulation_results")
 def refresh_simulation_results():
+    scan_runs()
+    simulations = get_indexed_simulations()
 
     #Components for result visualisation:
     selectSimName = dbc.Col(
@@ -263,9 +1284,9 @@ def refresh_simulation_results():
                             dbc.Select(
                                 id="simName",
                                 options=[
-                                    {"label": f, "value": f} for f in sorted(list(listdir(path)))
+                                    {"label": f, "value": f} for f in simulations
                                 ],
-                                value = sorted(list(listdir(path)))[0] if listdir(path) else "no simulations found"
+                                value = simulations[0] if simulations else "no simulations found"
                             )
                         ]),
                         width = {'size': 2, 'offset': 1}
@@ -336,18 +1357,11 @@ def refresh_simulation_results():
     return results_content
 
 def trim_client(client):
-    result = re.search('sim\d+_(.*)_output.txt', client)
+    result = re.search('sim\d+_(.*)_output\.(txt|bin)', client)
     return result.group(1)
 
-def load_qualChanges():
-    for c in client_data:
-        client_dict = client_data[c]
-        if not 'qualChanges' in client_dict:
-            client_dict['qualChanges'] = count_changes(client_dict['qualLevel'])
-
-def display_qualChanges(clients, aggregation):
-    load_unit('qualLevel')
-    load_qualChanges()
+def build_qualChanges_figure(clients, aggregation):
+    load_kpis(clients)
     df = pd.DataFrame(columns=['Client', 'Quality_Changes', 'Algorithm'])
     rows = []
     for client in clients:
@@ -374,18 +1388,15 @@ def display_qualChanges(clients, aggregation):
             paper_bgcolor='#272B30',
             height=700)
 
+    return Fig
+
+def display_qualChanges(clients, aggregation):
+    Fig = get_cached_figure("qualChanges", clients, aggregation, lambda: build_qualChanges_figure(clients, aggregation))
     Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
     return dbc.Row(Graph)
 
-def load_bufferUnderruns():
-    for c in client_data:
-        client_dict = client_data[c]
-        if not 'bufferUnderruns' in client_dict:
-            client_dict['bufferUnderruns'] = get_col_sum(client_dict['bul'], 'Buffer_Underrun')
-
-def display_Underruns(clients, aggregation):
-    load_unit('bul')
-    load_bufferUnderruns()
+def build_Underruns_figure(clients, aggregation):
+    load_kpis(clients)
     df = pd.DataFrame(columns=['Client', 'Underruns', 'Algorithm'])
     rows = []
     for client in clients:
@@ -412,18 +1423,15 @@ def display_Underruns(clients, aggregation):
             paper_bgcolor='#272B30',
             height=700)
 
+    return Fig
+
+def display_Underruns(clients, aggregation):
+    Fig = get_cached_figure("Underruns", clients, aggregation, lambda: build_Underruns_figure(clients, aggregation))
     Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
     return dbc.Row(Graph)
 
-def load_avgQuality():
-    for c in client_data:
-        client_dict = client_data[c]
-        if not 'avgQuality' in client_dict:
-            client_dict['avgQuality'] = get_col_avg(client_dict['qualLevel'], 'Rep_Level')
-
-def display_AvgQualLevel(clients, aggregation):
-    load_unit('qualLevel')
-    load_avgQuality()
+def build_AvgQualLevel_figure(clients, aggregation):
+    load_kpis(clients)
     df = pd.DataFrame(columns=['Client', 'Quality', 'Algorithm'])
     rows = []
     for client in clients:
@@ -450,18 +1458,15 @@ def display_AvgQualLevel(clients, aggregation):
             paper_bgcolor='#272B30',
             height=700)
 
+    return Fig
+
+def display_AvgQualLevel(clients, aggregation):
+    Fig = get_cached_figure("AvgQualLevel", clients, aggregation, lambda: build_AvgQualLevel_figure(clients, aggregation))
     Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
     return dbc.Row(Graph)
 
-def load_avgEff():
-    for c in client_data:
-        client_dict = client_data[c]
-        if not 'avgEff' in client_dict:
-            client_dict['avgEff'] = get_col_avg(client_dict['eff'], 'Bytes_Received')
-
-def display_AvgEff(clients, aggregation):
-    load_unit('eff')
-    load_avgEff()
+def build_AvgEff_figure(clients, aggregation):
+    load_kpis(clients)
     df = pd.DataFrame(columns=['Client', 'Efficiency', 'Algorithm'])
     rows = []
     for client in clients:
@@ -488,106 +1493,178 @@ def display_AvgEff(clients, aggregation):
             paper_bgcolor='#272B30',
             height=700)
 
+    return Fig
+
+def display_AvgEff(clients, aggregation):
+    Fig = get_cached_figure("AvgEff", clients, aggregation, lambda: build_AvgEff_figure(clients, aggregation))
     Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
     return dbc.Row(Graph)
 
-def display_graph(clients, unit, aggregation):
+#a bar for every client or a box for every algorithm of a metric in kpiGraphs
+def build_kpi_figure(clients, kpi, aggregation):
+    load_kpis(clients)
+    values = np.array([client_data[client][kpi] for client in clients], dtype=float)
     Fig = go.Figure()
-    load_unit(unit)
-    if aggregation == 'all':
-        for client in clients:
-            df = client_data[str(client)][unit]
-            Fig.add_scatter(x=df.index, y=df[extract_unit[unit]["value"]], mode='lines', line_shape=extract_unit[unit]["line_shape"], name=str(client))
-        Fig.update_layout(xaxis_title="seconds",
-        yaxis_title=extract_unit[unit]["y_axis"],
-        title=extract_unit[unit]["title"],
+    if not aggregation:
+        Fig.add_bar(x=[trim_client(client) for client in clients], y=values)
+        xaxis_title = "Client"
+    else:
+        Fig.add_box(x=[get_algo(client) for client in clients], y=values, width = 0.2)
+        xaxis_title = "Algorithm"
+    Fig.update_layout(xaxis_title=xaxis_title,
+        yaxis_title=kpiGraphs[kpi]["y_axis"],
+        title=kpiGraphs[kpi]["title"],
         template="plotly_dark",
         plot_bgcolor='#272B30',
         paper_bgcolor='#272B30',
         height=700)
-        Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-        return dbc.Row(Graph)
-    if aggregation == 'stacked':
+    return Fig
+
+def display_kpi(clients, kpi, aggregation):
+    Fig = get_cached_figure(kpi, clients, aggregation, lambda: build_kpi_figure(clients, kpi, aggregation))
+    Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
+    return dbc.Row(Graph)
+
+#split a series into buckets, returns the values as one row per bucket padded with NaN and the index of the first value of every row
+def bucket_rows(y, size):
+    rows = -(-len(y) // size)
+    padded = np.full(rows * size, np.nan)
+    padded[:len(y)] = y
+    return padded.reshape(rows, size), np.arange(rows) * size
+
+#indices of at most nPoints points, the minimum of low and the maximum of high in every bucket and the last point
+def minmax_indices(low, high, nPoints):
+    size = -(-len(low) // (nPoints // 2))
+    lowRows, offsets = bucket_rows(low, size)
+    highRows, offsets = bucket_rows(high, size)
+    lows = offsets + np.argmin(np.where(np.isnan(lowRows), np.inf, lowRows), axis = 1)
+    highs = offsets + np.argmax(np.where(np.isnan(highRows), -np.inf, highRows), axis = 1)
+    keep = np.unique(np.concatenate([lows, highs, [len(low) - 1]]))
+    return keep[keep < len(low)]
+
+#reduce a trace to the minimum and maximum of every bucket, unlike plain decimation this keeps all peaks
+def downsample_minmax(x, y, nPoints):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype = "float64")
+    if len(x) <= nPoints:
+        return x, y
+    keep = minmax_indices(y, y, nPoints)
+    return x[keep], y[keep]
+
+#returns the part of a trace inside xRange plus one point on each side, so the lines reach the edges of the plot
+def crop_trace(x, y, xRange):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if xRange is None:
+        return x, y
+    first = max(np.searchsorted(x, xRange[0], side = "left") - 1, 0)
+    last = np.searchsorted(x, xRange[1], side = "right") + 1
+    return x[first:last], y[first:last]
+
+#returns the cached figure of a graph of the loaded simulation, build creates the figure if it is not cached
+def get_cached_figure(kind, clients, aggregation, build):
+    key = (get_bound_simulation()["key"], tuple(clients), kind, aggregation)
+    with figureCacheLock:
+        metrics.cache("figure", key in figureCache)
+        if key in figureCache:
+            figureCache.move_to_end(key)
+            return figureCache[key]
+    Fig = build()
+    with figureCacheLock:
+        figureCache[key] = Fig
+        while len(figureCache) > figureCacheSize:
+            figureCache.popitem(last = False)
+    return Fig
+
+#large figures are drawn with WebGL, SVG traces get slow with hundreds of traces
+def use_webgl(nTraces, nPoints):
+    return nTraces > glTraceThreshold or nPoints > glPointThreshold
+
+#add a line trace with at most maxTracePoints points for the visible range, stacked traces are not supported by WebGL
+def add_line(Fig, x, y, xRange, gl = False, **kwargs):
+    x, y = crop_trace(x, y, xRange)
+    if not "stackgroup" in kwargs:
+        x, y = downsample_minmax(x, y, maxTracePoints)
+    if gl and not "stackgroup" in kwargs:
+        Fig.add_scattergl(x=x, y=y, **kwargs)
+    else:
+        Fig.add_scatter(x=x, y=y, **kwargs)
+
+#add the lower and upper edge of a filled band, both edges keep the same seconds so the fill joins matching points
+#every bucket keeps the minimum of the lower and the maximum of the upper edge
+def add_band(Fig, x, lower, upper, xRange, fillcolor, **kwargs):
+    croppedX, lower = crop_trace(x, lower, xRange)
+    croppedX, upper = crop_trace(x, upper, xRange)
+    lower = np.asarray(lower, dtype = "float64")
+    upper = np.asarray(upper, dtype = "float64")
+    if len(croppedX) > maxTracePoints:
+        keep = minmax_indices(lower, upper, maxTracePoints)
+        croppedX, lower, upper = croppedX[keep], lower[keep], upper[keep]
+    Fig.add_scatter(x=croppedX, y=lower, mode='lines', line_width=0, showlegend=False, hoverinfo='skip', **kwargs)
+    Fig.add_scatter(x=croppedX, y=upper, mode='lines', line_width=0, showlegend=False, hoverinfo='skip', fill='tonexty', fillcolor=fillcolor, **kwargs)
+
+#build the figure of a time series graph, xRange limits the data to the part the user zoomed in on
+@metrics.timed("build_time_figure")
+def build_time_figure(clients, unit, aggregation, xRange = None):
+    Fig = go.Figure()
+    load_unit(unit, clients)
+    title = extract_unit[unit]["title"]
+    if aggregation == 'all':
+        gl = use_webgl(len(clients), sum(min(len(client_data[str(c)][unit]), maxTracePoints) for c in clients))
         for client in clients:
             df = client_data[str(client)][unit]
-            Fig.add_scatter(x=df.index, y=df[extract_unit[unit]["value"]], mode='lines', line_shape=extract_unit[unit]["line_shape"], name=str(client), stackgroup='one')
-        Fig.update_layout(xaxis_title="seconds",
-        yaxis_title=extract_unit[unit]["y_axis"],
-        title=extract_unit[unit]["title"],
-        template="plotly_dark",
-        plot_bgcolor='#272B30',
-        paper_bgcolor='#272B30',
-        height=700)
-        Graph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-        return dbc.Row(Graph)
-    if aggregation == 'avg':
-        dfs = []
-        abrAlgos = {}
-        for client in clients:
-            algo = get_algo(client)
-            if not algo in abrAlgos:
-                abrAlgos[algo] = []
-            abrAlgos[algo].append(client_data[str(client)][unit])
-            dfs.append(client_data[str(client)][unit])
-        avgAll = get_average(dfs)
-        Fig.add_scatter(x=avgAll.index, y=avgAll[extract_unit[unit]["value"]], mode='lines' , name="All Clients")
-        for key, value in abrAlgos.items():
-            avg = get_average(value)
-            Fig.add_scatter(x=avg.index, y=avg[extract_unit[unit]["value"]], mode='lines' , name= key)
-        Fig.update_layout(xaxis_title="seconds",
-        yaxis_title=extract_unit[unit]["y_axis"],
-        title= "Average " + extract_unit[unit]["title"],
-        template="plotly_dark",
-        plot_bgcolor='#272B30',
-        paper_bgcolor='#272B30',
-        height=700)
-        Graph = dbc.Col(dcc.Graph(id="graph", figure=Fig))
-        return dbc.Row(Graph)
-    if aggregation == 'sum':
-        dfs = []
-        abrAlgos = {}
-        for client in clients:
-            algo = get_algo(client)
-            if not algo in abrAlgos:
-                abrAlgos[algo] = []
-            abrAlgos[algo].append(client_data[str(client)][unit])
-            dfs.append(client_data[str(client)][unit])
-        avgAll = get_sum(dfs)
-        Fig.add_scatter(x=avgAll.index, y=avgAll[extract_unit[unit]["value"]], mode='lines' , name="All Clients")
-        for key, value in abrAlgos.items():
-            avg = get_sum(value)
-            Fig.add_scatter(x=avg.index, y=avg[extract_unit[unit]["value"]], mode='lines' , name= key)
-        Fig.update_layout(xaxis_title="seconds",
-        yaxis_title=extract_unit[unit]["y_axis"],
-        title= "Average " + extract_unit[unit]["title"],
-        template="plotly_dark",
-        plot_bgcolor='#272B30',
-        paper_bgcolor='#272B30',
-        height=700)
-        Graph = dbc.Col(dcc.Graph(id="graph", figure=Fig))
-        return dbc.Row(Graph)
-    if aggregation == 'stacked_sum':
-        dfs = []
-        abrAlgos = {}
+            add_line(Fig, df.index, df[extract_unit[unit]["value"]], xRange, gl, mode='lines', line_shape=extract_unit[unit]["line_shape"], name=str(client))
+    if aggregation == 'stacked':
         for client in clients:
-            algo = get_algo(client)
-            if not algo in abrAlgos:
-                abrAlgos[algo] = []
-            abrAlgos[algo].append(client_data[str(client)][unit])
-            dfs.append(client_data[str(client)][unit])
-        avgAll = get_sum(dfs)
-        for key, value in abrAlgos.items():
-            avg = get_sum(value)
-            Fig.add_scatter(x=avg.index, y=avg[extract_unit[unit]["value"]], mode='lines' , name= key, stackgroup='one')
-        Fig.update_layout(xaxis_title="seconds",
-        yaxis_title=extract_unit[unit]["y_axis"],
-        title= "Average " + extract_unit[unit]["title"],
-        template="plotly_dark",
-        plot_bgcolor='#272B30',
-        paper_bgcolor='#272B30',
-        height=700)
-        Graph = dbc.Col(dcc.Graph(id="graph", figure=Fig))
-        return dbc.Row(Graph)
+            df = client_data[str(client)][unit]
+            add_line(Fig, df.index, df[extract_unit[unit]["value"]], xRange, mode='lines', line_shape=extract_unit[unit]["line_shape"], name=str(client), stackgroup='one')
+    if aggregation in ['avg', 'sum', 'stacked_sum']:
+        matrix = get_unit_matrix(unit, clients)
+        title = "Average " + extract_unit[unit]["title"]
+        if aggregation != 'stacked_sum':
+            x, y = aggregate_clients(matrix, [matrix["rows"][str(c)] for c in clients], aggregation)
+            add_line(Fig, x, y, xRange, mode='lines' , name="All Clients")
+        for key, rows in group_by_algo(matrix, clients).items():
+            x, y = aggregate_clients(matrix, rows, aggregation)
+            if aggregation == 'stacked_sum':
+                add_line(Fig, x, y, xRange, mode='lines' , name= key, stackgroup='one')
+            else:
+                add_line(Fig, x, y, xRange, mode='lines' , name= key)
+    if aggregation in ['band', 'ci']:
+        matrix = get_replication_matrix(unit, clients)
+        labels = replication_clients(matrix, clients)
+        runs = len(set(get_sim_id(c) for c in labels))
+        if aggregation == 'band':
+            title = extract_unit[unit]["title"] + " Percentiles " + str(bandPercentiles) + " over " + str(runs) + " runs"
+        else:
+            title = "Mean " + extract_unit[unit]["title"] + " with " + str(int(ciLevel * 100)) + "% CI over " + str(runs) + " runs"
+        for i, (key, rows) in enumerate(group_by_algo(matrix, labels).items()):
+            color = px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)]
+            if aggregation == 'band':
+                x, bands = percentile_band(matrix, rows)
+                outer, inner, center = (bands[0], bands[4]), (bands[1], bands[3]), bands[2]
+            else:
+                x, center, lower, upper = bootstrap_ci(matrix, rows)
+                outer, inner = (lower, upper), None
+            for band, alpha in [(outer, 0.15), (inner, 0.3)]:
+                if band is None:
+                    continue
+                add_band(Fig, x, band[0], band[1], xRange, line_color=color, legendgroup=key, fillcolor=band_color(color, alpha))
+            add_line(Fig, x, center, xRange, mode='lines', line_color=color, legendgroup=key, name=key)
+    Fig.update_layout(xaxis_title="seconds",
+    yaxis_title=extract_unit[unit]["y_axis"],
+    title=title,
+    template="plotly_dark",
+    plot_bgcolor='#272B30',
+    paper_bgcolor='#272B30',
+    height=700,
+    uirevision=unit + aggregation)
+    return Fig
+
+def display_graph(clients, unit, aggregation):
+    Fig = get_cached_figure(unit, clients, aggregation, lambda: build_time_figure(clients, unit, aggregation))
+    Graph = dbc.Col(dcc.Graph(id={"type": "timeGraph", "unit": unit, "aggregation": aggregation}, figure= Fig))
+    return dbc.Row(Graph)
 
 
 newName = dbc.Col(
@@ -848,9 +1925,7 @@ scheduleEventTime = dbc.Col(
                 )
 
 eventSchedule = dbc.Col(
-    html.Div([
-        dbc.Alert(e, color="info") for e in app_state["eventSchedule"]
-    ]), id = 'eventSchedule'
+    html.Div([]), id = 'eventSchedule'
 )
 
 setupClients = dbc.Card(
@@ -920,10 +1995,17 @@ selectGraphs = dbc.Col(
                     {"label": "Average Segment Sizes", "value": "avgSegSize"},
                     {"label": "Quality Level", "value": "qualLevel"},
                     {"label": "Average Quality Level", "value": "avgQualLevel"},
+                    {"label": "Throughput Percentiles", "value": "bandTp"},
+                    {"label": "Buffer Level Percentiles", "value": "bandBl"},
+                    {"label": "Throughput Mean CI", "value": "ciTp"},
+                    {"label": "Buffer Level Mean CI", "value": "ciBl"},
                     {"label": "Quality Changes", "value": "qualChanges"},
                     {"label": "Total Buffer Underruns", "value": "bufferUnderruns"},
                     {"label": "Average Playback Quality", "value": "avgQuality"},
-                    {"label": 'Average Efficiency', "value": "avgEff"}
+                    {"label": 'Average Efficiency', "value": "avgEff"},
+                    {"label": "Stalls", "value": "stalls"},
+                    {"label": "Startup Delay", "value": "startupDelay"},
+                    {"label": "Quality Change Magnitude", "value": "qualChangeMagnitude"}
                 ],
                 value=[],
                 id="selectedGraphs",
@@ -969,6 +2051,16 @@ newSim_content = html.Div([
                 dbc.Button("Start Simulation", color="primary", id="newSimButton", type= 'submit'),
                 width = {'size': 10, 'offset': 1})
         ]),
+        dbc.Row([
+            dbc.Col(
+                dbc.ListGroup(id="jobStatus", flush=True),
+                width = {'size': 10, 'offset': 1})
+        ]),
+        dcc.Interval(
+            id = 'job_update',
+            interval = 2*1000,
+            n_intervals = 0,
+        ),
     ])
 
 liveRes_content = html.Div([
@@ -982,10 +2074,12 @@ liveRes_content = html.Div([
         id="liveTabs",
         active_tab="bl"
         ),
-        dbc.Row(id="liveGraph"),
+        dbc.Row(dbc.Col(dcc.Graph(id="liveFigure")), id="liveGraph"),
+        #per trace count of the rows the browser already has, recreated with the tab so a new graph gets the full figure
+        dcc.Store(id='liveCursors'),
         dcc.Interval(
             id = 'live_update',
-            interval = 1*1000,
+            interval = liveMinInterval,
             n_intervals = 0,
         ),
          dbc.Row([
@@ -993,11 +2087,33 @@ liveRes_content = html.Div([
             liveEventRateBottleneck,
             dbc.Col(dbc.Button("Execute Event", color="primary", id="liveEventButton", type= 'submit'), align='center')
         ]),
+        dbc.Row([
+            dbc.Col(
+                dbc.ListGroup(id="liveEventAcks", flush=True),
+                width = {'size': 6, 'offset': 1})
+        ]),
+        #live events this page sent, they are shown as pending until the simulation acknowledges them
+        dcc.Store(id='liveEvents', data=[]),
+    ])
+
+debug_content = html.Div([
+        dbc.Row([
+            dbc.Col(dbc.Button("Reset", color="primary", id="resetMetricsButton"), width = 1),
+            dbc.Col(dbc.Input(id="profileCallback", placeholder="callback to profile, e.g. update_allGraphs"), width = 4),
+            dbc.Col(dbc.Button("Profile next run", color="primary", id="profileButton"), width = 2),
+        ], justify="center"),
+        html.Div(id="debugMetrics"),
+        dcc.Interval(
+            id = 'debug_update',
+            interval = 2*1000,
+            n_intervals = 0,
+        ),
     ])
 
 #show content of selected tab
 @app.callback(Output('tab-content', 'children'),
               Input('tabs', 'active_tab'))
+@metrics.callback
 def switch_tab(at):
     if at == 'results':
         content = refresh_simulation_results()
@@ -1006,17 +2122,19 @@ def switch_tab(at):
         return newSim_content
     elif at == 'live':
         return liveRes_content
+    elif at == 'debug':
+        return debug_content
 
 #set clients according to simulation
 @app.callback(
     Output('nrClients', 'options'),
     Input('simName', 'value')
 )
+@metrics.callback
 def set_nrClients_options(selected_simulation):
     if selected_simulation != "no simulations found":
-        options = [{"label": f, "value": f} for f in list(listdir(path + selected_simulation))]
-        sorted_options = sorted(options, key = lambda k: (int(k["value"])))
-        return sorted_options
+        options = [{"label": f, "value": f} for f in get_indexed_nrClients(selected_simulation)]
+        return options
     else:
         return []
 
@@ -1025,6 +2143,7 @@ def set_nrClients_options(selected_simulation):
     Output('nrClients', 'value'),
     Input('nrClients', 'options')
 )
+@metrics.callback
 def set_nrClients_value(options):
     if len(options) > 0:
         return options[0]['value']
@@ -1037,11 +2156,10 @@ def set_nrClients_value(options):
     Input('nrClients', 'value'),
     State('simName', 'value')
 )
+@metrics.callback
 def set_simId_options(nrClients, selected_simulation):
     if nrClients != "no simulations found":
-        simulations = list(dict.fromkeys([get_sim_id(s) for s in list(listdir(path + selected_simulation + "/" + nrClients))]))
-        if -1 in simulations: simulations.remove(-1)
-        options = [{"label": f, "value": f} for f in simulations]
+        options = [{"label": f, "value": f} for f in get_indexed_simIds(selected_simulation, nrClients)]
         return options
     else:
         return []
@@ -1051,6 +2169,7 @@ def set_simId_options(nrClients, selected_simulation):
     Output('simId', 'value'),
     Input('simId', 'options')
 )
+@metrics.callback
 def set_simId_value(options):
     if len(options) > 0:
         return options[0]['value']
@@ -1062,6 +2181,7 @@ def set_simId_value(options):
     Output('selectOutputs', 'value'),
     Input('selectOutputs', 'options')
 )
+@metrics.callback
 def set_selectClients_value(options):
     if len(options) > 0:
         options = [ o["value"] for o in options ]
@@ -1074,6 +2194,7 @@ def set_selectClients_value(options):
     Output('manageCollapse', 'is_open'),
     Input('manageClients', 'n_clicks')
 )
+@metrics.callback
 def toggle_manageClients(n):
     if n:
         return (n % 2)
@@ -1085,6 +2206,7 @@ def toggle_manageClients(n):
     Output('scheduleCollapse', 'is_open'),
     Input('scheduleEvent', 'n_clicks')
 )
+@metrics.callback
 def toggle_scheduleEvents(n):
     if n:
         return (n % 2)
@@ -1097,13 +2219,16 @@ def toggle_scheduleEvents(n):
     Input('loadButton', 'n_clicks'),
     State('simId', 'value'),
     State('nrClients', 'value'),
-    State('simName', 'value')
+    State('simName', 'value'),
+    State('session', 'data')
 )
-def loadSimData(n, simId, nrClients, simName):
+@metrics.callback
+def loadSimData(n, simId, nrClients, simName, session):
     if n > 0:
-        loadEventLog(path + simName + "/" + nrClients, simId)
-        load_data(path + simName + "/" + nrClients, simId)
-        outputs = get_outputs(path + simName + "/" + nrClients, simId)
+        set_session_simulation(session, (simName, nrClients, simId))
+        bind_simulation((simName, nrClients, simId), reload = True)
+        outputs = get_indexed_outputs(simName, nrClients, simId)
+        prefetch([], prefetchUnits)
         options = [{"label": f, "value": f} for f in outputs]
         return options
     else:
@@ -1113,15 +2238,17 @@ def loadSimData(n, simId, nrClients, simName):
 @app.callback(
     Output('graphs', 'children'),
     Input('selectOutputs','value'),
-    Input('selectedGraphs','value')
+    Input('selectedGraphs','value'),
+    State('session', 'data')
 )
-def update_allGraphs(clients, selectedGraphs):
+@metrics.callback
+def update_allGraphs(clients, selectedGraphs, session):
     
-    if client_data:
+    if bind_session(session) and client_data:
         graphs = []
         for g in selectedGraphs:
-            if g == 'eff' or g == 'totalEff' or g == 'avgEff':
-                get_efficiency()
+            if g == 'eff' or g == 'totalEff':
+                get_efficiency(clients)
             g = str(g)
             if g == "qualChanges":
                 graphs.append( display_qualChanges(clients, False) )
@@ -1137,15 +2264,100 @@ def update_allGraphs(clients, selectedGraphs):
             elif g == "avgEff":
                 graphs.append(display_AvgEff(clients, False) )
                 graphs.append(display_AvgEff(clients, True) )
+            elif g in kpiGraphs:
+                graphs.append(display_kpi(clients, g, False) )
+                graphs.append(display_kpi(clients, g, True) )
             elif g in aggregated_units:
                 graphs.append( display_graph(clients, aggregated_units[g]['unit'], aggregated_units[g]['aggregation']) )
             else:
                 graphs.append( display_graph(clients, g, 'all') )
-
+        prefetch(clients, [aggregated_units[g]['unit'] if g in aggregated_units else g for g in selectedGraphs if g in aggregated_units or g in extract_unit])
         return graphs
     else:
         return []
 
+#redraw a time series graph with the full resolution data of the range the user zoomed in on
+@app.callback(
+    Output({"type": "timeGraph", "unit": MATCH, "aggregation": MATCH}, 'figure'),
+    Input({"type": "timeGraph", "unit": MATCH, "aggregation": MATCH}, 'relayoutData'),
+    State({"type": "timeGraph", "unit": MATCH, "aggregation": MATCH}, 'id'),
+    State('selectOutputs','value'),
+    State('session', 'data'),
+    prevent_initial_call=True
+)
+@metrics.callback
+def zoom_graph(relayoutData, graphId, clients, session):
+    if not relayoutData or not bind_session(session):
+        raise PreventUpdate
+    if "xaxis.range[0]" in relayoutData:
+        xRange = [relayoutData["xaxis.range[0]"], relayoutData["xaxis.range[1]"]]
+    elif "xaxis.range" in relayoutData:
+        xRange = relayoutData["xaxis.range"]
+    elif "xaxis.autorange" in relayoutData:
+        return get_cached_figure(graphId["unit"], clients, graphId["aggregation"], lambda: build_time_figure(clients, graphId["unit"], graphId["aggregation"]))
+    else:
+        raise PreventUpdate
+    return build_time_figure(clients, graphId["unit"], graphId["aggregation"], xRange)
+
+#write the client setup, the event schedule and an empty real time event file of a run, returns the run directory
+#clients are lines like "<count> <algorithm> <video> <segment duration> sec", events like "<event> <time> <rate>Kbps"
+def write_sim_inputs(name, nrClients, simId, clients, events):
+    if not os.path.exists(path + name):
+        mkdir(path + name)
+    if not os.path.exists(path + name + "/" + nrClients):
+        mkdir(path + name + "/" + nrClients)
+    livePath = path + name + "/" + nrClients + "/"
+    eventFile = open(livePath + "sim" + str(simId) + "_event_schedule.txt", "w")
+    eventFile.write("Event Time Parameters\n")
+    for event in events:
+        eventFile.write(event)
+    eventFile.close()
+    clientFile = open(livePath + "sim" + str(simId) + "_clients.txt", "w")
+    for client in clients:
+        clientFile.write(client)
+    clientFile.close()
+    realTimeEventFile = open(livePath + "sim" + str(simId) + "_real_time_events.txt", "w")
+    realTimeEventFile.close()
+    return livePath
+
+#send a live event to a running simulation, returns the id its acknowledgement will carry
+#the control fifo reaches the simulation at its next check, the real time event file is the fallback while no simulation reads the fifo
+def send_live_event(livePath, simId, event):
+    eventId = uuid.uuid4().hex[:8]
+    line = event + " " + eventId + "\n"
+    prefix = livePath + "sim" + str(simId)
+    try:
+        #opening fails right away if no simulation has the fifo open for reading
+        fifo = os.open(prefix + "_control.fifo", os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        fifo = None
+    if fifo is not None:
+        try:
+            #a line is shorter than PIPE_BUF, so it is written completely or not at all
+            os.write(fifo, line.encode())
+            return eventId
+        except OSError:
+            pass
+        finally:
+            os.close(fifo)
+    with open(prefix + "_real_time_events.txt", "a") as realTimeEventFile:
+        realTimeEventFile.write(line)
+    return eventId
+
+#returns the live events the simulation applied so far, keyed by their id
+def read_event_acks(livePath, simId):
+    acks = OrderedDict()
+    try:
+        with open(livePath + "sim" + str(simId) + "_event_acks.txt") as ackFile:
+            next(ackFile, None)
+            for line in ackFile:
+                fields = line.rstrip("\n").split(";")
+                if len(fields) == 5:
+                    acks[fields[0]] = {"event": fields[1], "value": fields[2], "time": float(fields[3]), "source": fields[4]}
+    except OSError:
+        pass
+    return acks
+
 #prepare a new simulation
 @app.callback(
     Output('live_data', 'children'),
@@ -1159,32 +2371,24 @@ def update_allGraphs(clients, selectedGraphs):
     State('delayBottle', 'value'),
     State('rateClients', 'value'),
     State('delayClients', 'value'),
+    State('session', 'data'),
 )
-def prepare_newSim(n, name, simId, servers, video, tcp, rateBottle, delayBottle, rateClients, delayClients):
+@metrics.callback
+def prepare_newSim(n, name, simId, servers, video, tcp, rateBottle, delayBottle, rateClients, delayClients, session):
     if n > 0 and name:
-        nrClients = str(app_state["nrClients"])
-        if not os.path.exists(path + name):
-            mkdir(path + name)
-        if not os.path.exists(path + name + "/" + nrClients):
-            mkdir(path + name + "/" + nrClients)
-        livePath = path + name + "/" + nrClients + "/"
-        eventFile = open(livePath + "sim" + str(simId) + "_event_schedule.txt", "w")
-        eventFile.write("Event Time Parameters\n")
-        for event in app_state["eventSchedule"]:
-            eventFile.write(event)
-        eventFile.close()
-        clientFile = open(livePath + "sim" + str(simId) + "_clients.txt", "w")
-        for client in app_state["clients"]:
-            clientFile.write(client)
-        clientFile.close()
-        realTimeEventFile = open(livePath + "sim" + str(simId) + "_real_time_events.txt", "w")
-        app_state["realTimeFile"] = livePath + "sim" + str(simId) + "_real_time_events.txt"
-        realTimeEventFile.close()
-        app_state["eventSchedule"] = []
-        app_state["clients"] = []
-        return  [livePath, simId]
+        #take the scenario and start a new one in the same transaction, clients added meanwhile go to the next simulation
+        with SessionState(session).update() as state:
+            nrClients = str(state["nrClients"])
+            livePath = write_sim_inputs(name, nrClients, simId, state["clients"], state["eventSchedule"])
+            state.update(sessionStateDefaults)
+        return  [livePath, simId, nrClients]
     return []
 
+#called once the simulation of the new simulation tab exited
+def finish_simulation(livePath, name, nrClients, simId):
+    finish_live_run(livePath, simId)
+    index_run(name, nrClients, simId)
+
 #starts a new simulation
 @app.callback(
     Output('newSimButton', 'color'), #Todo finish indicator
@@ -1201,122 +2405,141 @@ def prepare_newSim(n, name, simId, servers, video, tcp, rateBottle, delayBottle,
     State('packet-pacing', 'value'),
     State('simScript', 'value')
 )
+@metrics.callback
 def start_newSim(p, name, simId, servers, tcp, rateBottle, delayBottle, rateClients, delayClients, lInputs, pacing, script):
-    if p and app_state["simFinished"]:
-        nrClients = str(app_state["nrClients"])
-        app_state["nrClients"] = 0
-        app_state["simFinished"] = False
-        live_client_data = {}
+    if p:
+        nrClients = p[2]
         liveInputsEnabled = 1 if lInputs else 0
         packetPacingEnabled = 1 if pacing else 0 
-        print("starting simulation")
-        system("./waf --run=\"" + script +" \
-            --simulationName=" + name +" \
-            --simulationId=" + str(simId) +" \
-            --numberOfClients=" + nrClients + " \
-            --numberOfServers=" + str(servers) +" \
-            --tcp=" + tcp + " \
-            --bottleNeckRate=" + str(rateBottle) + "Kbps \
-            --bottleNeckDelay=" + str(delayBottle) + "ms \
-            --channelRate=" + str(rateClients) + "Kbps \
-            --channelDelay=" + str(delayClients) + "ms \
-            --liveInputs=" + str(liveInputsEnabled) + " \
-            --packetPacing=" + str(packetPacingEnabled) + "\"")
-        print("sim finished")
-        app_state["simFinished"] = True
+        command = waf_command(script, OrderedDict([
+            ("simulationName", name),
+            ("simulationId", simId),
+            ("numberOfClients", nrClients),
+            ("numberOfServers", servers),
+            ("tcp", tcp),
+            ("bottleNeckRate", str(rateBottle) + "Kbps"),
+            ("bottleNeckDelay", str(delayBottle) + "ms"),
+            ("channelRate", str(rateClients) + "Kbps"),
+            ("channelDelay", str(delayClients) + "ms"),
+            ("liveInputs", liveInputsEnabled),
+            ("packetPacing", packetPacingEnabled)]), build = False)
+        simJobs.submit(name + "/" + nrClients + "/sim" + str(simId), command, p[0] + "sim" + str(simId),
+                       lambda job: finish_simulation(p[0], name, nrClients, "sim" + str(simId)))
+        print("simulation queued")
         return  'primary'
     print("no sim started")
     return 'primary'
 
+#shows the state of all simulation jobs, a cancel button stops a queued or running job
+@app.callback(
+    Output('jobStatus', 'children'),
+    Input('job_update', 'n_intervals'),
+    Input({'type': 'cancelJob', 'job': ALL}, 'n_clicks'),
+)
+@metrics.callback
+def update_jobStatus(n, cancelClicks):
+    triggered = dash.callback_context.triggered[0]
+    if triggered["prop_id"].startswith("{") and triggered["value"]:
+        simJobs.cancel(json.loads(triggered["prop_id"].rsplit(".", 1)[0])["job"])
+    items = []
+    for job in reversed(simJobs.status()):
+        color = {"queued": "secondary", "running": "info", "done": "success", "failed": "danger", "cancelled": "warning"}[job["state"]]
+        cancel = dbc.Button("Cancel", color="danger", size="sm", id={'type': 'cancelJob', 'job': job["id"]}, disabled=job["state"] not in ("queued", "running"))
+        items.append(dbc.ListGroupItem(dbc.Row([
+            dbc.Col(job["name"]),
+            dbc.Col(job["state"]),
+            dbc.Col(str(round(job["wallTime"], 1)) + " s"),
+            dbc.Col(cancel)
+        ]), color=color))
+    return items
+
 #updates live results
-@app.callback(Output('liveGraph', 'children'),
-              Output('live_update', 'disabled'),                            
+#the full figure is only sent for a new live tab or when a client appears, otherwise only the rows added since the last tick are appended
+@app.callback(Output('liveFigure', 'figure'),
+              Output('liveFigure', 'extendData'),
+              Output('liveCursors', 'data'),
+              Output('live_update', 'disabled'),
+              Output('live_update', 'interval'),
               Input('live_update', 'n_intervals'),
+              Input('liveTabs', 'active_tab'),
               State('live_data', 'children'),
               State('tabs', 'active_tab'),
-              State('liveTabs', 'active_tab'),
-              State('liveGraph', 'children'),)
-def updateLiveGraphs(n ,liveData, tab, liveTab, prevGraph):
-    if tab == 'live' and liveData:
-        livePath = liveData[0]
-        liveId = "sim" + str(liveData[1])
-        if not app_state["loading"]:
-            new_load_live_data(livePath, liveId, liveTab)
-        Fig = go.Figure()
-        clients = get_outputs(livePath, liveId)
-        if liveTab == 'bl':
-            for client in clients:
-                if str(client) in live_client_data and 'bl' in live_client_data[str(client)]:
-                    df = live_client_data[str(client)]['bl']
-                    Fig.add_scatter(x=df["Time_Now"], y=df["Buffer_Level"], mode='lines', line_shape='hv', name=str(client))
-            Fig.update_layout(xaxis_title="seconds",
-            yaxis_title="BufferLevel(seconds)",
-            title="Buffer Level",
-            template="plotly_dark",
-            plot_bgcolor='#272B30',
-            paper_bgcolor='#272B30',
-            height=700)
-            blGraph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-            return blGraph, False
-        if liveTab == 'tp':
-            for client in clients:
-                if str(client) in live_client_data and 'tp' in live_client_data[str(client)]:
-                    df = live_client_data[str(client)]['tp']
-                    Fig.add_scatter(x=df.index, y=df["Bytes_Received"], mode='lines', name=str(client))
-            Fig.update_layout(xaxis_title="seconds",
-            yaxis_title="Kb",
-            title="Throughput",
-            template="plotly_dark",
-            plot_bgcolor='#272B30',
-            paper_bgcolor='#272B30',
-            height=700)
-            tpGraph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-            return tpGraph, False
-        if liveTab == 'segSize':
-            for client in clients:
-                if str(client) in live_client_data and 'segSize' in live_client_data[str(client)]:
-                    df = live_client_data[str(client)]['segSize']
-                    Fig.add_scatter(x=df["Download_Request_Sent"], y=df["Segment_Size"], mode='lines', line_shape='hv', name=str(client))
-            Fig.update_layout(xaxis_title="seconds",
-            yaxis_title="Segment Size",
-            title="SegmentSize",
-            template="plotly_dark",
-            plot_bgcolor='#272B30',
-            paper_bgcolor='#272B30',
-            height=700)
-            segSizeGraph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-            return segSizeGraph, False
-        if liveTab == 'qualLevel':
-            for client in clients:
-                if str(client) in live_client_data and 'qualLevel' in live_client_data[str(client)]:
-                    df = live_client_data[str(client)]['qualLevel']
-                    Fig.add_scatter(x=df["Time_Now"], y=df["Rep_Level"], mode='lines', line_shape='hv', name=str(client))
-            Fig.update_layout(xaxis_title="seconds",
-            yaxis_title="Quality Level",
-            title="Video Quality",
-            template="plotly_dark",
-            plot_bgcolor='#272B30',
-            paper_bgcolor='#272B30',
-            height=700)
-            qualLevelGraph = dbc.Col(dcc.Graph(id="graph", figure= Fig))
-            return qualLevelGraph, False
-        
-        return [], False
-    return [], True
+              State('liveCursors', 'data'),
+              State('live_update', 'interval'),)
+@metrics.callback
+def updateLiveGraphs(n, liveTab, liveData, tab, cursors, interval):
+    if tab != 'live' or not liveData:
+        return dash.no_update, dash.no_update, dash.no_update, True, dash.no_update
+    livePath = liveData[0]
+    liveId = "sim" + str(liveData[1])
+    run = liveLoads.do((livePath, liveId), lambda: new_load_live_data(livePath, liveId))
+    live_client_data = get_live_series(run)
+    spec = live_extract_unit[liveTab]
+    clients = sorted([c for c in live_client_data if liveTab in live_client_data[c]], key = cmp_to_key(cmp_clients))
+    liveSeries = [live_client_data[c][liveTab] for c in clients]
+    key = [livePath, liveId, liveTab]
+    sent = [series["total"] for series in liveSeries]
+    if cursors and cursors["key"] == key and cursors["traces"] == clients:
+        update = {"x": [], "y": []}
+        traces = []
+        for i, series in enumerate(liveSeries):
+            x = series["columns"][spec["index"]]
+            new = min(series["total"] - cursors["sent"][i], len(x), liveMaxPoints)
+            if new > 0:
+                update["x"].append(x[len(x) - new:])
+                update["y"].append(series["columns"][spec["value"]][len(x) - new:])
+                traces.append(i)
+        if not traces:
+            return dash.no_update, dash.no_update, dash.no_update, False, min(2 * (interval or liveMinInterval), liveMaxInterval)
+        return dash.no_update, [update, traces, liveMaxPoints], {"key": key, "traces": clients, "sent": sent}, False, liveMinInterval
+
+    Fig = go.Figure()
+    addTrace = Fig.add_scattergl if use_webgl(len(liveSeries), sum(min(len(s["columns"][spec["index"]]), liveMaxPoints) for s in liveSeries)) else Fig.add_scatter
+    for client, series in zip(clients, liveSeries):
+        addTrace(x=series["columns"][spec["index"]][-liveMaxPoints:], y=series["columns"][spec["value"]][-liveMaxPoints:],
+                 mode='lines', line_shape=spec["line_shape"], name=client)
+    Fig.update_layout(xaxis_title=spec["timeUnit"],
+    yaxis_title=spec["y_axis"],
+    title=spec["title"],
+    template="plotly_dark",
+    plot_bgcolor='#272B30',
+    paper_bgcolor='#272B30',
+    height=700)
+    return Fig, dash.no_update, {"key": key, "traces": clients, "sent": sent}, False, liveMinInterval
 
 #execute a live event
 @app.callback(
-    Output('liveEventButton', 'color'),
+    Output('liveEvents', 'data'),
     Input('liveEventButton', 'n_clicks'),
     State('liveEventType', 'value'),
     State('liveEventRateBottleneck', 'value'),
+    State('live_data', 'children'),
+    State('liveEvents', 'data'),
 )
-def executeEvent(n, eventType, bottleneckRate):
-    if n > 0:
-        realTimeEventFile = open(app_state["realTimeFile"], "a")
-        realTimeEventFile.write(eventType + " " + str(bottleneckRate)+"Kbps" + "\n")
-        realTimeEventFile.close()
-    return "primary"
+@metrics.callback
+def executeEvent(n, eventType, bottleneckRate, liveData, sent):
+    if n and liveData:
+        event = eventType + " " + str(bottleneckRate) + "Kbps"
+        eventId = send_live_event(liveData[0], liveData[1], event)
+        return sent + [{"id": eventId, "event": event}]
+    raise PreventUpdate
+
+#show the live events the simulation applied and the ones this page sent that are still pending
+@app.callback(
+    Output('liveEventAcks', 'children'),
+    Input('live_update', 'n_intervals'),
+    Input('liveEvents', 'data'),
+    State('live_data', 'children'),
+)
+@metrics.callback
+def update_liveEventAcks(n, sent, liveData):
+    if not liveData:
+        return []
+    acks = read_event_acks(liveData[0], liveData[1])
+    items = [dbc.ListGroupItem(ack["event"] + " " + ack["value"] + " applied at " + str(round(ack["time"], 3)) + "s (" + ack["source"] + ")", color="success")
+             for ack in acks.values()]
+    items += [dbc.ListGroupItem(e["event"] + " sent", color="info") for e in sent if e["id"] not in acks]
+    return items
 
 #schedule an event
 @app.callback(
@@ -1324,12 +2547,45 @@ def executeEvent(n, eventType, bottleneckRate):
     Input('scheduleEventButton', 'n_clicks'),
     State('scheduleEventType', 'value'),
     State('scheduleEventRateBottleneck', 'value'),
-    State('scheduleEventTime', 'value')
+    State('scheduleEventTime', 'value'),
+    State('session', 'data')
 )
-def scheduleEvents(n, eventType, bottleneckRate, time):
+@metrics.callback
+def scheduleEvents(n, eventType, bottleneckRate, time, session):
     if n > 0:
-        app_state["eventSchedule"].append(eventType + " " + str(time) + " " + str(bottleneckRate) + "Kbps\n")
-    return [ dbc.ListGroupItem(e) for e in app_state["eventSchedule"] ]
+        with SessionState(session).update() as state:
+            state["eventSchedule"].append(eventType + " " + str(time) + " " + str(bottleneckRate) + "Kbps\n")
+    else:
+        state = SessionState(session).get()
+    return [ dbc.ListGroupItem(e) for e in state["eventSchedule"] ]
+
+#show the metrics of the worker process that serves the request
+@app.callback(
+    Output('debugMetrics', 'children'),
+    Input('debug_update', 'n_intervals'),
+    Input('resetMetricsButton', 'n_clicks'),
+    Input('profileButton', 'n_clicks'),
+    State('profileCallback', 'value'),
+)
+def update_debugPanel(n, resetClicks, profileClicks, profileName):
+    trigger = dash.callback_context.triggered[0]["prop_id"] if dash.callback_context.triggered else ""
+    if trigger == "resetMetricsButton.n_clicks":
+        metrics.reset()
+    if trigger == "profileButton.n_clicks" and profileName:
+        metrics.profile_next(profileName)
+    snapshot = metrics.snapshot()
+    timers = pd.DataFrame([dict(stage = name, **timer) for name, timer in snapshot["timers"].items()], columns = ["stage", "count", "total", "mean", "max", "last"])
+    timers = timers.sort_values("total", ascending = False).round(4)
+    caches = pd.DataFrame([dict(cache = name, **cache) for name, cache in snapshot["caches"].items()], columns = ["cache", "hits", "misses", "ratio"]).round(3)
+    counters = pd.DataFrame(list(snapshot["counters"].items()), columns = ["counter", "value"])
+    return [
+        html.P("process " + str(snapshot["pid"]) + ", " + str(round(snapshot["uptime"])) + "s since reset"),
+        dbc.Table.from_dataframe(timers, striped=True, bordered=True, size="sm"),
+        dbc.Table.from_dataframe(caches, striped=True, bordered=True, size="sm"),
+        dbc.Table.from_dataframe(counters, striped=True, bordered=True, size="sm"),
+        html.P("next runs profiled: " + (", ".join(snapshot["profileNext"]) or "none")),
+        dbc.ListGroup([dbc.ListGroupItem(f) for f in snapshot["profiles"]], flush=True),
+    ]
 
 #add clients to simulation
 @app.callback(
@@ -1338,13 +2594,30 @@ def scheduleEvents(n, eventType, bottleneckRate, time):
     State('nrClients', 'value'),
     State('clientAlgo', 'value'),
     State('videoFile', 'value'),
-    State('segmentDuration', 'value')
+    State('segmentDuration', 'value'),
+    State('session', 'data')
 )
-def addClients(n, nrClients, algo, video, segDuration):
+@metrics.callback
+def addClients(n, nrClients, algo, video, segDuration, session):
     if n > 0:
-        app_state["clients"].append(str(nrClients) + " " + algo + " " + video + " " + str(segDuration) + " sec\n")
-        app_state["nrClients"] += nrClients
-    return [ dbc.ListGroupItem(c) for c in app_state["clients"] ]
+        with SessionState(session).update() as state:
+            state["clients"].append(str(nrClients) + " " + algo + " " + video + " " + str(segDuration) + " sec\n")
+            state["nrClients"] += nrClients
+    else:
+        state = SessionState(session).get()
+    return [ dbc.ListGroupItem(c) for c in state["clients"] ]
 
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    #`python dash_visualization.py --index` fills the summary index for all runs that are not indexed yet
+    if "--index" in sys.argv:
+        scan_runs()
+        with open_index() as connection:
+            runs = connection.execute("SELECT simName, nrClients, simId FROM runs WHERE indexed = 0").fetchall()
+        for run in runs:
+            print("indexing " + "/".join(run))
+            try:
+                index_run(*run)
+            except (OSError, ValueError, KeyError) as e:
+                print("skipped " + "/".join(run) + ": " + str(e))
+    else:
+        app.run_server(debug=True, threaded=True)
\ No newline at end of file
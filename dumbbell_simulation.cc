@@ -52,6 +52,7 @@ uint32_t simulationId;
 uint32_t numberOfClients;
 uint32_t numberOfServers;
 uint32_t liveInputs;
+double liveEventInterval = 0.1;
 uint32_t enablePacing;
 uint32_t live_event_index;
 std::string simulationName;
@@ -86,6 +87,7 @@ main (int argc, char *argv[])
   cmd.AddValue ("channelRate", "The data rate of all other links", channelRate);
   cmd.AddValue ("channelDelay", "The delay of all other links", channelDelay);
   cmd.AddValue ("liveInputs", "Wheter live inputs are enabled or not. 1 or 0", liveInputs);
+  cmd.AddValue ("liveEventInterval", "Simulated seconds between two checks for live events", liveEventInterval);
   cmd.AddValue ("packetPacing", "Wheter packet pacing is enabled or not. 1 or 0", enablePacing);
   cmd.Parse (argc, argv);
 
@@ -217,8 +219,11 @@ main (int argc, char *argv[])
  // create logfile for event logging
   std::string Log = dashLogDirectory + simulationName + "/" + ToString(numberOfClients)  + "/sim" + ToString(simulationId) + "_" + "event_log.txt";
   std::string liveEventFilePath = dirstr + "sim" + ToString(simulationId) + "_real_time_events.txt";
+  // live events come through the control fifo, the real time event file is the fallback, applied events are acknowledged in the ack file
+  std::string controlFifoPath = dirstr + "sim" + ToString(simulationId) + "_control.fifo";
+  std::string ackLogPath = dirstr + "sim" + ToString(simulationId) + "_event_acks.txt";
   // load scheduled events
-  DashEventScheduler scheduler (Log, liveEventFilePath, liveInputs);
+  DashEventScheduler scheduler (Log, liveEventFilePath, liveInputs, controlFifoPath, ackLogPath, liveEventInterval);
   scheduler.ScheduleEvents((dirstr + "sim" + ToString(simulationId) + "_event_schedule.txt").c_str());
 
   
@@ -0,0 +1,107 @@
+# Watches the log directory of a live simulation for dash_visualization.py
+# inotify tells which files were written to on Linux, other systems fall back to comparing the size and mtime of the files
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+#inotify event masks from <sys/inotify.h>
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_Q_OVERFLOW = 0x4000
+inotifyEvent = struct.Struct("iIII")
+
+#seconds between two scans of the polling fallback
+pollInterval = 0.25
+
+def load_inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno = True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+libc = load_inotify()
+
+class RunWatcher(object):
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.changed = set()
+        self.stopped = threading.Event()
+        self.fd = None
+        if libc is not None:
+            self.fd = libc.inotify_init1(os.O_CLOEXEC)
+            if self.fd >= 0 and libc.inotify_add_watch(self.fd, os.fsencode(path), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+                os.close(self.fd)
+                self.fd = -1
+            if self.fd < 0:
+                self.fd = None
+        #all files that are already there are new to the reader, the watch is added first so no write in between is missed
+        self.sizes = self.scan()
+        self.changed.update(self.sizes)
+        self.mode = "inotify" if self.fd is not None else "polling"
+        threading.Thread(target=self.watch_inotify if self.fd is not None else self.watch_polling, daemon=True).start()
+
+    #size and modification time of every file in the directory
+    def scan(self):
+        stamps = {}
+        try:
+            for entry in os.scandir(self.path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    stamps[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return stamps
+
+    def mark(self, names):
+        if names:
+            with self.lock:
+                self.changed.update(names)
+
+    def watch_inotify(self):
+        while not self.stopped.is_set():
+            #wake up now and then to notice stop()
+            if not select.select([self.fd], [], [], 1.0)[0]:
+                continue
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except OSError:
+                break
+            names = set()
+            offset = 0
+            while offset < len(buf):
+                wd, mask, cookie, length = inotifyEvent.unpack_from(buf, offset)
+                offset += inotifyEvent.size
+                if mask & IN_Q_OVERFLOW:
+                    #events were lost, every file might have changed
+                    names.update(self.scan())
+                elif length:
+                    names.add(buf[offset:offset + length].rstrip(b"\0").decode())
+                offset += length
+            self.mark(names)
+        os.close(self.fd)
+
+    def watch_polling(self):
+        while not self.stopped.wait(pollInterval):
+            sizes = self.scan()
+            self.mark([name for name, stamp in sizes.items() if self.sizes.get(name) != stamp])
+            self.sizes = sizes
+
+    #returns the names of the files that changed since the last call
+    def take_changes(self):
+        with self.lock:
+            changed = self.changed
+            self.changed = set()
+        return changed
+
+    def stop(self):
+        self.stopped.set()
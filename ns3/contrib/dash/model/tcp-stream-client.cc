@@ -218,6 +218,21 @@ TcpStreamClient::GetTypeId (void)
                    UintegerValue (0),
                    MakeUintegerAccessor (&TcpStreamClient::m_clientId),
                    MakeUintegerChecker<uint32_t> ())
+    .AddAttribute ("LogFormat",
+                   "Format of the client data log: text writes _output.txt, binary writes fixed size records to _output.bin",
+                   StringValue ("text"),
+                   MakeStringAccessor (&TcpStreamClient::m_logFormat),
+                   MakeStringChecker ())
+    .AddAttribute ("LogBufferSize",
+                   "Bytes of log data collected before they are written, 0 flushes after every record. Live results lag behind with large buffers",
+                   UintegerValue (0),
+                   MakeUintegerAccessor (&TcpStreamClient::m_logBufferSize),
+                   MakeUintegerChecker<uint32_t> ())
+    .AddAttribute ("ThroughputBinInterval",
+                   "Duration of a throughput bin in microseconds, one row with the bytes received per bin is logged instead of one row per packet. 0 logs every packet",
+                   UintegerValue (0),
+                   MakeUintegerAccessor (&TcpStreamClient::m_throughputBinInterval),
+                   MakeUintegerChecker<uint64_t> ())
   ;
   return tid;
 }
@@ -237,6 +252,8 @@ TcpStreamClient::TcpStreamClient ()
   m_segmentsInBuffer = 0;
   m_bufferUnderrun = false;
   m_currentPlaybackIndex = 0;
+  m_binStart = 0;
+  m_binBytes = 0;
 
 }
 
@@ -505,6 +522,11 @@ TcpStreamClient::StopApplication ()
       m_socket->SetRecvCallback (MakeNullCallback<void, Ptr<Socket> > ());
       m_socket = 0;
     }
+  if (m_binBytes > 0)
+    {
+      LogThroughputBin ();
+    }
+  dataLog.flush ();
   dataLog.close();
 }
 
@@ -548,68 +570,144 @@ void
 TcpStreamClient::LogThroughput (uint32_t packetSize)
 {
   NS_LOG_FUNCTION (this);
-  dataLog << Simulator::Now ().GetMicroSeconds ()  / (double) 1000000 << ";;;;;;;;;;;;"
-  << packetSize << ";\n";
-  dataLog.flush ();
+  if (m_throughputBinInterval > 0)
+    {
+      int64_t timeNow = Simulator::Now ().GetMicroSeconds ();
+      int64_t binStart = timeNow - timeNow % (int64_t) m_throughputBinInterval;
+      if (binStart != m_binStart)
+        {
+          if (m_binBytes > 0)
+            {
+              LogThroughputBin ();
+              //bins without packets since the last one are logged empty, so there is one row per bin
+              for (m_binStart += m_throughputBinInterval; m_binStart < binStart; m_binStart += m_throughputBinInterval)
+                {
+                  LogThroughputBin ();
+                }
+            }
+          m_binStart = binStart;
+        }
+      m_binBytes += packetSize;
+      return;
+    }
+  if (m_logFormat == "binary")
+    {
+      LogRecord (1, -1, Simulator::Now ().GetMicroSeconds (), packetSize);
+    }
+  else
+    {
+      dataLog << Simulator::Now ().GetMicroSeconds ()  / (double) 1000000 << ";;;;;;;;;;;;"
+      << packetSize << ";\n";
+    }
+  FlushLog ();
+}
+
+void
+TcpStreamClient::LogThroughputBin ()
+{
+  NS_LOG_FUNCTION (this);
+  if (m_logFormat == "binary")
+    {
+      LogRecord (1, -1, m_binStart, m_binBytes, m_throughputBinInterval);
+    }
+  else
+    {
+      dataLog << m_binStart / (double) 1000000 << ";;;;;;;;;;;;"
+      << m_binBytes << ";;" << m_throughputBinInterval / (double) 1000000 << "\n";
+    }
+  m_binBytes = 0;
+  FlushLog ();
 }
 
 void
 TcpStreamClient::LogBufferUnderrun (bool buffer_empty)
 {
   NS_LOG_FUNCTION (this);
-  if(buffer_empty){
+  if (m_logFormat == "binary"){
+    LogRecord (4, -1, Simulator::Now ().GetMicroSeconds (), buffer_empty ? 1 : 0);
+  }else if(buffer_empty){
     dataLog << Simulator::Now ().GetMicroSeconds ()  / (double) 1000000 << ";;;;;;;;;;;;;1\n";
   }else {
     dataLog << Simulator::Now ().GetMicroSeconds ()  / (double) 1000000 << ";;;;;;;;;;;;;0\n";
   }
  
-  dataLog.flush ();
+  FlushLog ();
 }
 
 void
 TcpStreamClient::LogDownload ()
 {
   NS_LOG_FUNCTION (this);
-  dataLog << ";" << m_segmentCounter << ";"
-              << m_downloadRequestSent / (double)1000000 << ";"
-              << m_transmissionStartReceivingSegment / (double)1000000 << ";"
-              << m_transmissionEndReceivingSegment / (double)1000000 << ";"
-              << m_videoData.segmentSize.at (m_currentRepIndex).at (m_segmentCounter) << ";"
-              << "Y;;;;;;;\n";
-  dataLog.flush ();
+  if (m_logFormat == "binary")
+    {
+      LogRecord (2, m_segmentCounter, m_downloadRequestSent, m_transmissionStartReceivingSegment,
+                 m_transmissionEndReceivingSegment, m_videoData.segmentSize.at (m_currentRepIndex).at (m_segmentCounter));
+    }
+  else
+    {
+      dataLog << ";" << m_segmentCounter << ";"
+                  << m_downloadRequestSent / (double)1000000 << ";"
+                  << m_transmissionStartReceivingSegment / (double)1000000 << ";"
+                  << m_transmissionEndReceivingSegment / (double)1000000 << ";"
+                  << m_videoData.segmentSize.at (m_currentRepIndex).at (m_segmentCounter) << ";"
+                  << "Y;;;;;;;\n";
+    }
+  FlushLog ();
 }
 
 void
 TcpStreamClient::LogBuffer ()
 {
   NS_LOG_FUNCTION (this);
-  dataLog << m_transmissionEndReceivingSegment / (double)1000000 << ";;;;;;;;;;;"
-            << m_bufferData.bufferLevelOld.back () / (double)1000000 << ";\n"
-            << m_transmissionEndReceivingSegment / (double)1000000 << ";;;;;;;;;;;"
-            << m_bufferData.bufferLevelNew.back () / (double)1000000 << ";;\n";
-  dataLog.flush ();
+  if (m_logFormat == "binary")
+    {
+      LogRecord (3, -1, m_transmissionEndReceivingSegment, m_bufferData.bufferLevelOld.back ());
+      LogRecord (3, -1, m_transmissionEndReceivingSegment, m_bufferData.bufferLevelNew.back ());
+    }
+  else
+    {
+      dataLog << m_transmissionEndReceivingSegment / (double)1000000 << ";;;;;;;;;;;"
+                << m_bufferData.bufferLevelOld.back () / (double)1000000 << ";\n"
+                << m_transmissionEndReceivingSegment / (double)1000000 << ";;;;;;;;;;;"
+                << m_bufferData.bufferLevelNew.back () / (double)1000000 << ";;\n";
+    }
+  FlushLog ();
 }
 
 void
 TcpStreamClient::LogAdaptation (algorithmReply answer)
 {
   NS_LOG_FUNCTION (this);
-  dataLog << answer.decisionTime / (double)1000000 << ";" 
-                << m_segmentCounter << ";;;;;;;"
-                << m_currentRepIndex << ";"
-                << answer.decisionCase << ";"
-                << answer.delayDecisionCase << ";;;\n";
-  dataLog.flush ();
+  if (m_logFormat == "binary")
+    {
+      LogRecord (5, m_segmentCounter, answer.decisionTime, m_currentRepIndex, answer.decisionCase, answer.delayDecisionCase);
+    }
+  else
+    {
+      dataLog << answer.decisionTime / (double)1000000 << ";" 
+                    << m_segmentCounter << ";;;;;;;"
+                    << m_currentRepIndex << ";"
+                    << answer.decisionCase << ";"
+                    << answer.delayDecisionCase << ";;;\n";
+    }
+  FlushLog ();
 }
 
 void
 TcpStreamClient::LogPlayback ()
 {
   NS_LOG_FUNCTION (this);
-  dataLog << Simulator::Now ().GetMicroSeconds () / (double) 1000000 << ";"
-              << m_currentPlaybackIndex << ";;;;;;"
-              << m_playbackData.playbackIndex.at (m_currentPlaybackIndex) << ";;;;;;\n";
-  dataLog.flush ();
+  if (m_logFormat == "binary")
+    {
+      LogRecord (6, m_currentPlaybackIndex, Simulator::Now ().GetMicroSeconds (), m_playbackData.playbackIndex.at (m_currentPlaybackIndex));
+    }
+  else
+    {
+      dataLog << Simulator::Now ().GetMicroSeconds () / (double) 1000000 << ";"
+                  << m_currentPlaybackIndex << ";;;;;;"
+                  << m_playbackData.playbackIndex.at (m_currentPlaybackIndex) << ";;;;;;\n";
+    }
+  FlushLog ();
 }
 
 void
@@ -622,8 +720,15 @@ TcpStreamClient::LogBufferLevel ()
                                                        (timeNow - m_throughput.transmissionEnd.back ()) , (int64_t)0);
   }
   NS_LOG_FUNCTION (this);
-  dataLog << timeNow / (double) 1000000 << ";;;;;;;;;;;" << bufferLevel / (double) 1000000 << ";;\n";
-  dataLog.flush ();
+  if (m_logFormat == "binary")
+    {
+      LogRecord (3, -1, timeNow, bufferLevel);
+    }
+  else
+    {
+      dataLog << timeNow / (double) 1000000 << ";;;;;;;;;;;" << bufferLevel / (double) 1000000 << ";;\n";
+    }
+  FlushLog ();
 }
 
 void
@@ -632,15 +737,59 @@ TcpStreamClient::InitializeLogFiles (std::string simulationName, std::string sim
   NS_LOG_FUNCTION (this);
 
   //create main logging file
-  std::string Log = dashLogDirectory + simulationName + "/" +  numberOfClients  + "/sim" + simulationId + "_" + "cl" + clientId + "_"  + m_algoName + "_output.txt";
-  dataLog.open (Log.c_str ());
-  dataLog << "Time_Now;Segment_Index;Download_Request_Sent;Download_Start;Download_End;Segment_Size;Download_OK;"
-  << "Quality_Level;"
-  << "Rep_Level;Case;DelayCase;"
-  << "Buffer_Level;"
-  << "Bytes_Received;"
-  << "Buffer_Underrun\n";
+  std::string Log = dashLogDirectory + simulationName + "/" +  numberOfClients  + "/sim" + simulationId + "_" + "cl" + clientId + "_"  + m_algoName
+                    + (m_logFormat == "binary" ? "_output.bin" : "_output.txt");
+  //the stream buffer has to be set before the file is opened
+  if (m_logBufferSize > 0)
+    {
+      m_logStreamBuffer.resize (m_logBufferSize);
+      dataLog.rdbuf ()->pubsetbuf (m_logStreamBuffer.data (), m_logBufferSize);
+    }
+  if (m_logFormat == "binary")
+    {
+      dataLog.open (Log.c_str (), std::ios::out | std::ios::binary);
+      dataLog.write ("DASHBIN1", 8);
+    }
+  else
+    {
+      dataLog.open (Log.c_str ());
+      dataLog << "Time_Now;Segment_Index;Download_Request_Sent;Download_Start;Download_End;Segment_Size;Download_OK;"
+      << "Quality_Level;"
+      << "Rep_Level;Case;DelayCase;"
+      << "Buffer_Level;"
+      << "Bytes_Received;"
+      << "Buffer_Underrun";
+      //binned throughput rows carry the duration of their bin in an extra column
+      if (m_throughputBinInterval > 0)
+        {
+          dataLog << ";Bin_Duration";
+        }
+      dataLog << "\n";
+    }
   dataLog.flush ();
 }
 
+void
+TcpStreamClient::LogRecord (uint8_t type, int32_t index, int64_t time, int64_t a, int64_t b, int64_t c)
+{
+  //little endian, the layout matches binaryLogDtype in dash_visualization.py
+  char record[40] = {0};
+  record[0] = type;
+  memcpy (record + 4, &index, 4);
+  memcpy (record + 8, &time, 8);
+  memcpy (record + 16, &a, 8);
+  memcpy (record + 24, &b, 8);
+  memcpy (record + 32, &c, 8);
+  dataLog.write (record, sizeof (record));
+}
+
+void
+TcpStreamClient::FlushLog ()
+{
+  if (m_logBufferSize == 0)
+    {
+      dataLog.flush ();
+    }
+}
+
 } // Namespace ns3
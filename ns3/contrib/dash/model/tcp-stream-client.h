@@ -26,6 +26,7 @@
 #include "ns3/traced-callback.h"
 #include <iostream>
 #include <fstream>
+#include <vector>
 #include "tcp-stream-adaptation-algorithm.h"
 #include "tcp-stream-interface.h"
 #include "tobasco2.h"
@@ -226,6 +227,14 @@ private:
    * - size of packet
    */
   void LogThroughput (uint32_t packetSize);
+  /*
+   * \brief Log the bytes received in the current throughput bin
+   *
+   * - start of the bin
+   * - bytes received during the bin
+   * - duration of the bin
+   */
+  void LogThroughputBin ();
    /*
    * \brief Log whether the buffer is currently empty
    *
@@ -263,6 +272,18 @@ private:
    * and log files containing the used adaptation algorithm are created for output.
    */
   void InitializeLogFiles (std::string simulationName, std::string simulationId, std::string clientId, std::string numberOfClients);
+  /*
+   * \brief Write one fixed size record to the binary log.
+   *
+   * Every record has 40 bytes: the record type (1 byte), 3 bytes padding, an index (int32)
+   * and four int64 fields time, a, b and c. Times are in microseconds.
+   * \param type the kind of record, see the Log functions for the meaning of the fields
+   */
+  void LogRecord (uint8_t type, int32_t index, int64_t time, int64_t a, int64_t b = 0, int64_t c = 0);
+  /*
+   * \brief Flush the log after a record unless writes are buffered.
+   */
+  void FlushLog ();
 
   uint32_t m_dataSize; //!< packet payload size
   uint8_t *m_data; //!< packet payload data
@@ -291,6 +312,12 @@ private:
   uint64_t m_segmentDuration; //!< The duration of a segment in microseconds
 
   std::ofstream dataLog; //!< Output stream for all data
+  std::string m_logFormat; //!< Format of the data log, "text" or "binary"
+  uint32_t m_logBufferSize; //!< Size in bytes of the write buffer of the data log, 0 flushes after every record
+  std::vector<char> m_logStreamBuffer; //!< Write buffer of the data log
+  uint64_t m_throughputBinInterval; //!< Duration in microseconds of a throughput bin, 0 logs every packet
+  int64_t m_binStart; //!< Start in microseconds of the current throughput bin
+  int64_t m_binBytes; //!< Bytes received in the current throughput bin
 
   uint64_t m_downloadRequestSent; //!< Logging the point in time in microseconds when a download request was sent to the server
 
@@ -20,14 +20,31 @@
 
 namespace ns3 {
 
-DashEventScheduler::DashEventScheduler(const std::string& eventLogPath, const std::string& liveEventFilePath ,u_int32_t liveInputs)
+DashEventScheduler::DashEventScheduler(const std::string& eventLogPath, const std::string& liveEventFilePath ,u_int32_t liveInputs,
+                                       const std::string& controlFifoPath, const std::string& ackLogPath, double checkInterval)
 { 
-  live_event_index = 0;
+  liveEventOffset = 0;
+  controlFifo = -1;
+  liveEventInterval = checkInterval;
   eventLog.open (eventLogPath.c_str ());
   eventLog << "Time_Now;Event;Value\n";
   eventLog.flush ();
   if (liveInputs != 0){
-    CheckLiveEvents(liveEventFilePath);
+    this->liveEventFilePath = liveEventFilePath;
+    liveEventFile.open (liveEventFilePath.c_str ());
+    if (!controlFifoPath.empty ()){
+      // the read end is opened non blocking, so the simulation neither waits for the dashboard to open the fifo nor for data
+      if (mkfifo (controlFifoPath.c_str (), 0600) != 0 && errno != EEXIST){
+        std::cerr << "could not create control fifo " << controlFifoPath << ", live events are read from " << liveEventFilePath << "\n";
+      }
+      controlFifo = open (controlFifoPath.c_str (), O_RDONLY | O_NONBLOCK);
+    }
+    if (!ackLogPath.empty ()){
+      ackLog.open (ackLogPath.c_str ());
+      ackLog << "Id;Event;Value;Time_Now;Source\n";
+      ackLog.flush ();
+    }
+    CheckLiveEvents ();
   }
 }
 
@@ -55,33 +72,71 @@ DashEventScheduler::ScheduleEvents (const char* eventFilePath)
 }
 
 void
-DashEventScheduler::CheckLiveEvents (const std::string& liveEventFilePath)
+DashEventScheduler::CheckLiveEvents ()
 {
-  std::ifstream efile(liveEventFilePath);
-  std::string line;
-  uint64_t line_count = 0;
-  while (std::getline(efile, line))
-  { 
-    line_count ++;
-    if(line_count > live_event_index){
-      std::istringstream iss(line);
-      std::string event;
-      std::string value;
-      if (!(iss >> event >> value)) {
-        line_count --;
-        break;
-      }
-      if (event == "BottleneckRate"){
-        Simulator::Schedule(Seconds (0.001), &DashEventScheduler::changeBottleneckRate, this, value);
-      }
-      if (event == "EndSimulation"){
-        Simulator::Stop ();
-      }
+  // only complete lines are handled, a partially written line is read again at the next check
+  if (controlFifo >= 0){
+    char buf[4096];
+    ssize_t n;
+    while ((n = read (controlFifo, buf, sizeof (buf))) > 0){
+      controlBuffer.append (buf, n);
+    }
+    size_t end;
+    while ((end = controlBuffer.find ('\n')) != std::string::npos){
+      HandleLiveEvent (controlBuffer.substr (0, end), "fifo");
+      controlBuffer.erase (0, end + 1);
     }
   }
-  live_event_index = line_count;
-  Simulator::Schedule (Seconds (1), &DashEventScheduler::CheckLiveEvents, this,liveEventFilePath);
-  efile.close();
+  if (!liveEventFile.is_open ()){
+    liveEventFile.clear ();
+    liveEventFile.open (liveEventFilePath.c_str ());
+  }
+  if (liveEventFile.is_open ()){
+    liveEventFile.clear ();
+    liveEventFile.seekg (liveEventOffset);
+    std::string line;
+    while (std::getline (liveEventFile, line) && !liveEventFile.eof ()){
+      HandleLiveEvent (line, "file");
+      liveEventOffset = liveEventFile.tellg ();
+    }
+  }
+  Simulator::Schedule (Seconds (liveEventInterval), &DashEventScheduler::CheckLiveEvents, this);
+}
+
+// a live event line is "<event> <value> [<id>]", the id is echoed in the acknowledgement
+void
+DashEventScheduler::HandleLiveEvent (const std::string& line, const char *source)
+{
+  std::istringstream iss(line);
+  std::string event;
+  std::string value;
+  std::string id;
+  if (!(iss >> event >> value)) {
+    std::cerr << "invalid live event " << line << "\n";
+    return;
+  }
+  iss >> id;
+  if (event == "BottleneckRate"){
+    Simulator::Schedule(Seconds (0.001), &DashEventScheduler::ApplyLiveEvent, this, event, value, id, source);
+  }
+  if (event == "EndSimulation"){
+    ApplyLiveEvent (event, value, id, source);
+  }
+}
+
+void
+DashEventScheduler::ApplyLiveEvent (const std::string& event, const std::string& value, const std::string& id, const char *source)
+{
+  if (event == "BottleneckRate"){
+    changeBottleneckRate (value);
+  }
+  if (ackLog.is_open ()){
+    ackLog << id << ";" << event << ";" << value << ";" << Simulator::Now ().GetMicroSeconds () / (double) 1000000 << ";" << source << "\n";
+    ackLog.flush ();
+  }
+  if (event == "EndSimulation"){
+    Simulator::Stop ();
+  }
 }
 
 void
@@ -102,6 +157,12 @@ DashEventScheduler::changeBottleneckRate (const std::string& value)
 void
 DashEventScheduler::CleanUp (){
   eventLog.close();
+  ackLog.close();
+  liveEventFile.close();
+  if (controlFifo >= 0){
+    close (controlFifo);
+    controlFifo = -1;
+  }
 }
 
 } //namespace ns3
\ No newline at end of file
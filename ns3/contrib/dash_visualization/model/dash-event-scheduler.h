@@ -15,6 +15,8 @@
 #include <sys/stat.h>
 #include <sys/types.h>
 #include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
 #include <sstream>
 #include "ns3/flow-monitor-module.h"
 #include "ns3/tcp-stream-helper.h"
@@ -24,16 +26,28 @@ namespace ns3 {
 
 class DashEventScheduler{
 
-uint64_t live_event_index;
 std::ofstream eventLog;
+// live events are read from a fifo and from the real time event file, both without blocking and from where the last check stopped
+// the file is opened again at every check until it exists
+std::string liveEventFilePath;
+std::ifstream liveEventFile;
+std::streamoff liveEventOffset;
+int controlFifo;
+std::string controlBuffer;
+// every applied live event is acknowledged with its id and the simulation time it was applied at
+std::ofstream ackLog;
+double liveEventInterval;
 
 public:
     
-    DashEventScheduler(const std::string& eventLogPath, const std::string& liveEventFilePath, u_int32_t liveInputs);
+    DashEventScheduler(const std::string& eventLogPath, const std::string& liveEventFilePath, u_int32_t liveInputs,
+                       const std::string& controlFifoPath = "", const std::string& ackLogPath = "", double checkInterval = 0.1);
     void LogEvent (const char *event ,uint64_t value);
     void changeBottleneckRate (const std::string& value);
     void ScheduleEvents (const char* eventFilePath);
-    void CheckLiveEvents (const std::string& liveEventFilePath);
+    void CheckLiveEvents ();
+    void HandleLiveEvent (const std::string& line, const char *source);
+    void ApplyLiveEvent (const std::string& event, const std::string& value, const std::string& id, const char *source);
     void CleanUp ();
 };
 
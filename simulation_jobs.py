@@ -0,0 +1,157 @@
+# Runs ns-3 simulations as tracked subprocesses for dash_visualization.py
+# At most maxJobs simulations run at the same time, further jobs wait in a queue
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+
+#a job is queued until a slot is free, then running until the process exits
+#done and failed follow from the exit code, cancelled jobs are never started or were killed
+jobStates = ["queued", "running", "done", "failed", "cancelled"]
+
+#returns the waf command line of a simulation script, the options are passed to the script as --key=value
+def waf_command(script, options, build = True):
+    runArgs = " ".join([script] + ["--" + key + "=" + str(value) for key, value in options.items()])
+    return ["./waf", ("--run=" if build else "--run-no-build=") + runArgs]
+
+class SimulationJob(object):
+    def __init__(self, jobId, name, command, logPrefix, onFinish = None):
+        self.jobId = jobId
+        self.name = name
+        self.command = command
+        self.logPrefix = logPrefix
+        self.onFinish = onFinish
+        self.state = "queued"
+        self.returncode = None
+        self.process = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    #seconds the process ran, or has been running so far
+    def wall_time(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def to_dict(self):
+        return {"id": self.jobId, "name": self.name, "state": self.state, "returncode": self.returncode,
+                "wallTime": self.wall_time(), "stdout": self.logPrefix + "_stdout.txt", "stderr": self.logPrefix + "_stderr.txt"}
+
+#buildCommand runs before every job, one build at a time, the jobs themselves should not build then
+class JobManager(object):
+    def __init__(self, maxJobs = None, cwd = None, buildCommand = None):
+        self.maxJobs = maxJobs or os.cpu_count() or 1
+        self.cwd = cwd
+        self.buildCommand = buildCommand
+        self.buildLock = threading.Lock()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.nextId = 0
+
+    #queue a command, stdout and stderr go to <logPrefix>_stdout.txt and <logPrefix>_stderr.txt
+    #onFinish is called with the job from the watcher thread once the process exited
+    def submit(self, name, command, logPrefix, onFinish = None):
+        with self.lock:
+            job = SimulationJob(self.nextId, name, command, logPrefix, onFinish)
+            self.jobs[job.jobId] = job
+            self.nextId += 1
+            self.schedule()
+        return job
+
+    #start queued jobs while slots are free, the caller holds the lock
+    def schedule(self):
+        running = sum(1 for job in self.jobs.values() if job.state == "running")
+        for job in self.jobs.values():
+            if running >= self.maxJobs:
+                break
+            if job.state == "queued":
+                self.start(job)
+                running += 1
+
+    def start(self, job):
+        stdout = stderr = None
+        try:
+            stdout = open(job.logPrefix + "_stdout.txt", "w")
+            stderr = open(job.logPrefix + "_stderr.txt", "w")
+        except OSError as e:
+            for log in (stdout, stderr):
+                if log is not None:
+                    log.close()
+            print("could not start " + job.name + ": " + str(e))
+            job.state = "failed"
+            job.started = job.finished = time.time()
+            return
+        job.state = "running"
+        job.started = time.time()
+        threading.Thread(target=self.watch, args=(job, stdout, stderr), daemon=True).start()
+
+    #start a process of a job and wait for it, returns its exit code or None if the job was cancelled or the process could not start
+    def run_process(self, job, command, stdout, stderr):
+        with self.lock:
+            if job.state != "running":
+                return None
+            try:
+                #own process group, so cancelling also stops the simulation binary that waf started
+                job.process = subprocess.Popen(command, stdout=stdout, stderr=stderr, cwd=self.cwd, start_new_session=True)
+            except OSError as e:
+                print("could not start " + job.name + ": " + str(e))
+                return None
+        return job.process.wait()
+
+    #build if the manager has a build command, then run the job and free its slot
+    #only one build runs at a time, jobs that share a tree would otherwise build it concurrently
+    def watch(self, job, stdout, stderr):
+        returncode = 0
+        if self.buildCommand is not None:
+            with self.buildLock:
+                returncode = self.run_process(job, self.buildCommand, stdout, stderr)
+        if returncode == 0:
+            returncode = self.run_process(job, job.command, stdout, stderr)
+        stdout.close()
+        stderr.close()
+        with self.lock:
+            job.finished = time.time()
+            job.returncode = returncode
+            if job.state == "running":
+                job.state = "done" if returncode == 0 else "failed"
+            self.schedule()
+        print(job.name + " " + job.state + " after " + str(round(job.wall_time(), 1)) + "s")
+        if job.onFinish and job.state == "done":
+            try:
+                job.onFinish(job)
+            except Exception as e:
+                print("finishing " + job.name + " failed: " + str(e))
+
+    #cancel a queued job or kill a running one, returns False if the job already finished
+    def cancel(self, jobId):
+        with self.lock:
+            job = self.jobs.get(jobId)
+            if job is None or job.state not in ("queued", "running"):
+                return False
+            if job.state == "running" and job.process is not None:
+                try:
+                    os.killpg(job.process.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    #the process exited and its watcher has not marked the job yet
+                    pass
+            else:
+                job.finished = time.time()
+            job.state = "cancelled"
+            return True
+
+    def status(self):
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def active(self):
+        with self.lock:
+            return any(job.state in ("queued", "running") for job in self.jobs.values())
+
+    #block until no job is queued or running
+    def wait(self, interval = 1.0):
+        while self.active():
+            time.sleep(interval)
@@ -0,0 +1,145 @@
+# Parameter sweeps of ns-3 DASH simulations
+# Run it from the ns-3 directory like the dashboard itself:
+# `python simulation_sweep.py sweep.json`
+#
+# The sweep file is a JSON object. Every value in "grid" is a list and every combination of the lists is one run,
+# "runs" lists further runs explicitly. Settings missing in a run are taken from "defaults":
+# {
+#   "name": "weekly",
+#   "script": "dumbbell_simulation",
+#   "defaults": {"numberOfServers": 1, "channelRate": 100000, "channelDelay": 2, "video": "bbb.txt", "segmentDuration": 2,
+#                "packetPacing": 0, "events": ["BottleneckRate 30 2000Kbps"]},
+#   "grid": {"tcp": ["ns3::TcpNewReno", "ns3::TcpVegas"], "abr": [["panda"], ["panda", "festive"]],
+#            "bottleNeckRate": [2000, 5000], "bottleNeckDelay": [5, 20], "numberOfClients": [10, 50], "seed": [1, 2, 3]},
+#   "runs": [{"tcp": "ns3::TcpBic", "abr": ["tobasco"], "bottleNeckRate": 1000, "bottleNeckDelay": 50, "numberOfClients": 5, "seed": 1}]
+# }
+# "logFormat" ("text" or "binary"), "logBufferSize" (bytes) and "throughputBinInterval" (microseconds) set how the clients write their logs.
+# Rates are in Kbps and delays in ms. The clients of a run are split evenly over the algorithms of its abr mix.
+# Every run gets the next free simulation id in dash-log-files/<name>/<numberOfClients>/ and its settings are kept in simN_config.json.
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+import dash_visualization as dv
+from simulation_jobs import JobManager, waf_command
+
+sweepDefaults = {"numberOfServers": 1, "channelRate": 100000, "channelDelay": 2, "segmentDuration": 2, "packetPacing": 0, "events": []}
+
+#returns the settings of all runs of a sweep, the grid is expanded in the order of its keys
+def expand_sweep(sweep):
+    defaults = dict(sweepDefaults)
+    defaults.update(sweep.get("defaults", {}))
+    runs = []
+    grid = sweep.get("grid", {})
+    if grid:
+        keys = list(grid)
+        for values in itertools.product(*[grid[k] for k in keys]):
+            run = dict(defaults)
+            run.update(zip(keys, values))
+            runs.append(run)
+    for explicit in sweep.get("runs", []):
+        run = dict(defaults)
+        run.update(explicit)
+        runs.append(run)
+    for run in runs:
+        check_run(run)
+    return runs
+
+def check_run(run):
+    for key in ["tcp", "abr", "bottleNeckRate", "bottleNeckDelay", "numberOfClients", "video"]:
+        if key not in run:
+            raise ValueError("run " + json.dumps(run) + " has no " + key)
+    if run["tcp"] not in [p["value"] for p in dv.congestionProtocols]:
+        raise ValueError("unknown tcp variant " + str(run["tcp"]))
+    if isinstance(run["abr"], str):
+        run["abr"] = [run["abr"]]
+    for algo in run["abr"]:
+        if algo not in dv.abrAlgorithms:
+            raise ValueError("unknown abr algorithm " + str(algo))
+    if run["numberOfClients"] < len(run["abr"]):
+        raise ValueError("a run needs at least one client per abr algorithm")
+
+#lines of the client setup file, the clients are split evenly over the abr mix
+def client_lines(run):
+    lines = []
+    count, rest = divmod(run["numberOfClients"], len(run["abr"]))
+    for i, algo in enumerate(run["abr"]):
+        lines.append(str(count + (1 if i < rest else 0)) + " " + algo + " " + run["video"] + " " + str(run["segmentDuration"]) + " sec\n")
+    return lines
+
+#returns the smallest simulation id that is not used in the run directory yet
+def next_sim_id(name, nrClients):
+    runDir = dv.path + name + "/" + nrClients
+    if not os.path.isdir(runDir):
+        return 0
+    used = [int(dv.get_sim_id(str(f))[3:]) for f in os.listdir(runDir) if dv.get_sim_id(str(f)) != -1]
+    return max(used) + 1 if used else 0
+
+#write the input files of every run and queue it, returns the (name, nrClients, simId) of all runs
+def submit_sweep(sweep, manager, build = False):
+    name = sweep["name"]
+    runs = []
+    for run in expand_sweep(sweep):
+        nrClients = str(run["numberOfClients"])
+        simId = next_sim_id(name, nrClients)
+        runDir = dv.write_sim_inputs(name, nrClients, simId, client_lines(run), [e + "\n" for e in run["events"]])
+        with open(runDir + "sim" + str(simId) + "_config.json", "w") as configFile:
+            json.dump(run, configFile, indent=2)
+        options = [
+            ("simulationName", name),
+            ("simulationId", simId),
+            ("numberOfClients", nrClients),
+            ("numberOfServers", run["numberOfServers"]),
+            ("tcp", run["tcp"]),
+            ("bottleNeckRate", str(run["bottleNeckRate"]) + "Kbps"),
+            ("bottleNeckDelay", str(run["bottleNeckDelay"]) + "ms"),
+            ("channelRate", str(run["channelRate"]) + "Kbps"),
+            ("channelDelay", str(run["channelDelay"]) + "ms"),
+            ("liveInputs", 0),
+            ("packetPacing", run["packetPacing"])]
+        if "seed" in run:
+            options.append(("RngRun", run["seed"]))
+        #client log settings are attribute defaults of TcpStreamClient
+        if "logFormat" in run:
+            options.append(("ns3::TcpStreamClient::LogFormat", run["logFormat"]))
+        if "logBufferSize" in run:
+            options.append(("ns3::TcpStreamClient::LogBufferSize", run["logBufferSize"]))
+        if "throughputBinInterval" in run:
+            options.append(("ns3::TcpStreamClient::ThroughputBinInterval", run["throughputBinInterval"]))
+        command = waf_command(sweep.get("script", "dumbbell_simulation"), dict(options), build)
+        manager.submit(name + "/" + nrClients + "/sim" + str(simId), command, runDir + "sim" + str(simId),
+                       lambda job, n=nrClients, s=simId: dv.index_run(name, n, "sim" + str(s)))
+        runs.append((name, nrClients, simId))
+    return runs
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a sweep of simulations in parallel.")
+    parser.add_argument("sweep", help="JSON file describing the sweep")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="simulations running at the same time")
+    parser.add_argument("--dry-run", action="store_true", help="only print the runs of the sweep")
+    args = parser.parse_args()
+
+    with open(args.sweep) as sweepFile:
+        sweep = json.load(sweepFile)
+    if args.dry_run:
+        for run in expand_sweep(sweep):
+            print(json.dumps(run))
+        return 0
+    #build once up front, parallel waf builds in the same tree would get in each other's way
+    if subprocess.call(["./waf", "build"]) != 0:
+        print("build failed")
+        return 1
+    manager = JobManager(args.jobs)
+    runs = submit_sweep(sweep, manager)
+    print("queued " + str(len(runs)) + " runs, " + str(manager.maxJobs) + " at a time")
+    manager.wait()
+    states = [job["state"] for job in manager.status()]
+    print(str(states.count("done")) + " done, " + str(states.count("failed")) + " failed")
+    return 0 if states.count("done") == len(states) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
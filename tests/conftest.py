@@ -0,0 +1,16 @@
+# dash_visualization.py expects to be run from the ns-3 directory, it lists ./scratch and ./DashVideos when it is imported
+# the tests import it from a temporary directory with the same layout
+
+import os
+import sys
+import tempfile
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repoDir)
+
+ns3Dir = tempfile.mkdtemp(prefix="dash-tests-")
+for d in ["scratch", "DashVideos", "dash-log-files"]:
+    os.makedirs(os.path.join(ns3Dir, d))
+open(os.path.join(ns3Dir, "scratch", "dumbbell_simulation.cc"), "w").close()
+open(os.path.join(ns3Dir, "DashVideos", "video.txt"), "w").close()
+os.chdir(ns3Dir)
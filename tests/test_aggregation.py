@@ -0,0 +1,51 @@
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+
+import dash_visualization as dv
+
+def matrix(values, sims):
+    values = np.asarray(values, dtype = "float64")
+    return {"values": values, "sims": np.asarray(sims), "index": np.arange(values.shape[1])}
+
+def test_bootstrap_ci_without_rows():
+    x, mean, lower, upper = dv.bootstrap_ci(matrix([[1.0, 2.0]], ["sim0"]), [])
+    assert len(x) == len(mean) == len(lower) == len(upper) == 0
+
+def test_bootstrap_ci_without_values():
+    x, mean, lower, upper = dv.bootstrap_ci(matrix([[np.nan, np.nan], [np.nan, np.nan]], ["sim0", "sim1"]), [0, 1])
+    assert len(x) == len(mean) == len(lower) == len(upper) == 0
+
+def test_percentile_band_without_rows():
+    x, bands = dv.percentile_band(matrix([[1.0, 2.0]], ["sim0"]), [])
+    assert len(x) == 0 and bands.shape == (len(dv.bandPercentiles), 0)
+
+def test_band_edges_share_their_seconds():
+    rng = np.random.default_rng(0)
+    x = np.arange(10 * dv.maxTracePoints)
+    lower = rng.normal(0, 1, len(x))
+    upper = lower + rng.uniform(0, 5, len(x))
+    Fig = go.Figure()
+    dv.add_band(Fig, x, lower, upper, None, "rgba(99, 110, 250, 0.3)", line_color="#636EFA")
+    low, high = Fig.data
+    assert len(low.x) <= dv.maxTracePoints
+    np.testing.assert_array_equal(low.x, high.x)
+    assert low.y.min() == lower.min() and high.y.max() == upper.max()
+
+#a sweep writes runs of different configurations into the same directory, only the seeds of one config are replications
+def test_replications_share_the_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, "path", str(tmp_path) + "/")
+    monkeypatch.setattr(dv, "indexFile", str(tmp_path / "index.sqlite"))
+    runDir = tmp_path / "sweep" / "2"
+    runDir.mkdir(parents = True)
+    configs = {"sim0": ("ns3::TcpNewReno", 1), "sim1": ("ns3::TcpVegas", 1), "sim2": ("ns3::TcpNewReno", 2),
+               "sim3": ("ns3::TcpVegas", 2), "sim10": ("ns3::TcpNewReno", 3)}
+    for simId, (tcp, seed) in configs.items():
+        (runDir / (simId + "_config.json")).write_text(json.dumps({"tcp": tcp, "abr": ["panda"], "bottleNeckRate": 2000, "seed": seed}))
+    (runDir / "sim4_cl0_panda_output.txt").write_text("")
+    dv.scan_runs()
+    assert dv.get_replication_simIds("sweep", "2", "sim0") == ["sim2", "sim10"]
+    assert dv.get_replication_simIds("sweep", "2", "sim1") == ["sim3"]
+    #a run without a config file has no replications
+    assert dv.get_replication_simIds("sweep", "2", "sim4") == []
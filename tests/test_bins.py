@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+import dash_visualization as dv
+
+def bins(starts, received, duration):
+    return pd.DataFrame({"Time_Now": np.asarray(starts, dtype = "float64"), "Bytes_Received": np.asarray(received, dtype = "int64"),
+                         "Bin_Duration": float(duration)})
+
+def test_one_second_bins_stay_as_they_are():
+    table = bins([3, 4, 5, 6], [100, 0, 300, 50], 1)
+    tp = dv.extract_client_unit({"packets": table}, "tp")
+    assert list(tp.index) == [3, 4, 5, 6]
+    np.testing.assert_allclose(tp["Bytes_Received"].values, np.array([100, 0, 300, 50]) * 8 * 0.001)
+
+def test_long_bins_are_spread_over_their_seconds():
+    tp = dv.extract_client_unit({"packets": bins([10, 15], [5000, 2500], 5)}, "tp")
+    assert list(tp.index) == list(range(10, 20))
+    np.testing.assert_allclose(tp["Bytes_Received"].values, np.array([1000] * 5 + [500] * 5) * 8 * 0.001)
+
+def test_short_bins_are_summed_per_second():
+    seconds, received = dv.spread_bins(bins([0.0, 0.25, 0.5, 0.75, 1.0, 1.25], [1, 2, 3, 4, 5, 6], 0.25))
+    assert list(seconds) == [0, 1]
+    np.testing.assert_allclose(received, [10, 11])
+
+def test_bins_across_second_boundaries():
+    seconds, received = dv.spread_bins(bins([0.0, 1.5], [300, 300], 1.5))
+    assert list(seconds) == [0, 1, 2]
+    np.testing.assert_allclose(received, [200, 200, 200])
+
+def test_live_bins_match_the_whole_log():
+    table = bins(np.arange(0, 4, 0.3), np.arange(14) * 100, 0.3)
+    client_dict = {}
+    for chunk in (table.iloc[:5], table.iloc[5:9], table.iloc[9:]):
+        dv.append_live_units(client_dict, {name: chunk if name == "packets" else pd.DataFrame({c: np.empty(0, dtype) for c, dtype in t["columns"].items()})
+                                           for name, t in dv.recordTables.items()})
+    dv.flush_live_units(client_dict)
+    seconds, received = dv.spread_bins(table)
+    assert list(client_dict["tp"].view("Time_Now")) == list(seconds)
+    np.testing.assert_allclose(client_dict["tp"].view("Bytes_Received"), received * 8 * 0.001)
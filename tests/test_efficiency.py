@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+import dash_visualization as dv
+
+def tp_frame(values, start = 0):
+    return pd.DataFrame({"Bytes_Received": np.asarray(values, dtype = "float64")},
+                        index = pd.Index(range(start, start + len(values)), name = "Time_Now"))
+
+def rate_changes(changes):
+    return pd.DataFrame({"Time_Now": [t for t, r in changes], "Event": "BottleneckRate", "Value": [r for t, r in changes]})
+
+def test_empty_client_keeps_positions():
+    efficiencies = dv.compute_efficiency([tp_frame([100, 200]), tp_frame([]), tp_frame([300, 400, 500])], rate_changes([(0.0, 100.0)]))
+    assert [len(e) for e in efficiencies] == [2, 0, 3]
+    assert efficiencies[1].index.name == "Time_Now"
+    np.testing.assert_allclose(efficiencies[0]["Bytes_Received"].values, [1, 2])
+    np.testing.assert_allclose(efficiencies[2]["Bytes_Received"].values, [3, 4, 5])
+
+def test_only_empty_clients():
+    efficiencies = dv.compute_efficiency([tp_frame([]), tp_frame([])], rate_changes([(0.0, 100.0)]))
+    assert [len(e) for e in efficiencies] == [0, 0]
+
+#get_efficiency before the as-of join, one pair of masked .loc scans per rate change
+def baseline_efficiency(tp, bottleneck_rates):
+    efficiency = tp.copy()
+    for i in range(len(bottleneck_rates)):
+        current_rate = bottleneck_rates.iloc[i]["Value"]
+        if i == len(bottleneck_rates) - 1:
+            eff = efficiency.loc[efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"], "Bytes_Received"].div(current_rate)
+            efficiency.loc[efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"], "Bytes_Received"] = eff
+        else:
+            eff = efficiency.loc[(efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"]) & (efficiency.index < bottleneck_rates.iloc[i + 1]["Time_Now"]), "Bytes_Received"].div(current_rate)
+            efficiency.loc[(efficiency.index >= bottleneck_rates.iloc[i]["Time_Now"]) & (efficiency.index < bottleneck_rates.iloc[i + 1]["Time_Now"]), "Bytes_Received"] = eff
+    return efficiency
+
+def assert_same_as_baseline(tps, changes):
+    bottleneck_rates = rate_changes(changes)
+    efficiencies = dv.compute_efficiency(tps, bottleneck_rates)
+    assert len(efficiencies) == len(tps)
+    for tp, efficiency in zip(tps, efficiencies):
+        expected = baseline_efficiency(tp, bottleneck_rates)
+        assert list(efficiency.index) == list(expected.index)
+        np.testing.assert_allclose(efficiency["Bytes_Received"].values, expected["Bytes_Received"].values)
+
+clients = [tp_frame([500, 1200, 800, 950, 1000, 700, 300, 1100, 900, 600]), tp_frame([400, 600, 650, 620], start = 3), tp_frame([2000] * 12)]
+
+def test_no_rate_change():
+    assert_same_as_baseline(clients, [])
+
+def test_single_rate_at_start():
+    assert_same_as_baseline(clients, [(0.0, 5000.0)])
+
+def test_change_in_the_middle_of_a_second():
+    assert_same_as_baseline(clients, [(0.0, 5000.0), (4.5, 2000.0)])
+
+def test_first_change_after_the_start():
+    assert_same_as_baseline(clients, [(2.0, 5000.0), (6.0, 2000.0)])
+
+def test_several_changes():
+    assert_same_as_baseline(clients, [(0.0, 5000.0), (1.0, 4000.0), (2.25, 3000.0), (5.0, 8000.0), (5.5, 1000.0), (9.0, 2500.0)])
+
+def test_empty_client_same_as_baseline():
+    assert_same_as_baseline([clients[0], tp_frame([]), clients[1]], [(0.0, 5000.0), (4.5, 2000.0)])
@@ -0,0 +1,30 @@
+import sqlite3
+
+import pytest
+
+import dash_visualization as dv
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(dv, "indexFile", str(tmp_path / "index.sqlite"))
+
+def test_open_index_closes_the_connection(index):
+    with dv.open_index() as connection:
+        connection.execute("INSERT INTO runs VALUES ('a', '2', 'sim0', 0)")
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
+    with dv.open_index() as connection:
+        assert connection.execute("SELECT simId FROM runs").fetchall() == [("sim0",)]
+
+def test_open_index_rolls_back_on_error(index):
+    with pytest.raises(RuntimeError):
+        with dv.open_index() as connection:
+            connection.execute("INSERT INTO runs VALUES ('a', '2', 'sim0', 0)")
+            raise RuntimeError()
+    with dv.open_index() as connection:
+        assert connection.execute("SELECT simId FROM runs").fetchall() == []
+
+def test_simIds_are_sorted_by_number(index):
+    with dv.open_index() as connection:
+        connection.executemany("INSERT INTO runs VALUES ('a', '2', ?, 0)", [("sim10",), ("sim2",), ("sim1",)])
+    assert dv.get_indexed_simIds("a", "2") == ["sim1", "sim2", "sim10"]
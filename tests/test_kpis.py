@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dash_visualization as dv
+
+def tables(decisions = (), underruns = (), playback = (), packets = (), bins = None):
+    result = {"decisions": pd.DataFrame({"Time_Now": [t for t, l in decisions], "Rep_Level": [l for t, l in decisions]}, dtype = "float64"),
+              "underruns": pd.DataFrame({"Time_Now": [t for t, f in underruns], "Buffer_Underrun": [f for t, f in underruns]}, dtype = "float64"),
+              "playback": pd.DataFrame({"Time_Now": list(playback)}, dtype = "float64"),
+              "packets": pd.DataFrame({"Time_Now": np.array([t for t, b in packets], "float64"), "Bytes_Received": np.array([b for t, b in packets], "int64")})}
+    if bins is not None:
+        result["packets"]["Bin_Duration"] = np.full(len(packets), bins, "float64")
+    return result
+
+def kpis(t, changes = ((0.0, 100.0),)):
+    return dv.compute_client_kpis(t, np.array([c[0] for c in changes]), np.array([c[1] for c in changes]))
+
+def test_empty_log_has_no_metrics():
+    assert all(np.isnan(v) for v in kpis(tables()).values())
+
+def test_log_without_decisions():
+    result = kpis(tables(packets = [(0.5, 1000), (1.5, 1000)]))
+    for k in ["qualChanges", "qualChangeMagnitude", "avgQuality", "meanQuality", "startupDelay"]:
+        assert np.isnan(result[k])
+    assert result["stalls"] == 0 and result["bufferUnderruns"] == 0
+    assert not np.isnan(result["avgEff"])
+
+def test_log_without_packets():
+    result = kpis(tables(decisions = [(0.0, 1), (2.0, 3)], playback = [1.0]))
+    assert np.isnan(result["avgEff"])
+    assert result["qualChanges"] == 1 and result["startupDelay"] == 1.0
+    #without packets the last decision ends the quality average
+    assert result["avgQuality"] == 1.0
+
+def test_repeated_levels_are_no_change():
+    result = kpis(tables(decisions = [(0, 1), (1, 1), (2, 3), (3, 3), (4, 3), (5, 1), (6, 1)]))
+    assert result["qualChanges"] == 2
+    assert result["qualChangeMagnitude"] == 2.0
+    assert result["meanQuality"] == pytest.approx(13 / 7)
+
+def test_avg_quality_is_weighted_by_time():
+    result = kpis(tables(decisions = [(0.0, 1), (1.0, 4)], packets = [(4.0, 10)]))
+    assert result["avgQuality"] == pytest.approx((1 * 1 + 4 * 3) / 4)
+
+def test_stall_open_at_the_end_of_the_log():
+    result = kpis(tables(underruns = [(1.0, 1), (2.0, 0), (5.0, 1), (5.5, 1)], decisions = [(0.0, 1), (8.0, 1)]))
+    assert result["stalls"] == 2
+    assert result["bufferUnderruns"] == pytest.approx(1.0 + 3.0)
+
+def test_avg_eff_matches_the_eff_unit():
+    changes = [(0.0, 500.0), (2.5, 100.0), (4.0, 1000.0)]
+    t = tables(packets = [(0.3, 1500), (0.9, 1500), (1.2, 3000), (3.7, 1500), (5.1, 6000), (5.9, 1500)])
+    events = pd.DataFrame({"Time_Now": [c[0] for c in changes], "Event": "BottleneckRate", "Value": [c[1] for c in changes]})
+    eff = dv.compute_efficiency([dv.extract_client_unit(t, "tp")], events)[0]
+    assert kpis(t, changes)["avgEff"] == pytest.approx(eff["Bytes_Received"].mean())
+
+#a binned log of the same packets ends with its last bin, not at the start of it
+def test_binned_log_ends_with_its_last_bin():
+    decisions = [(0.0, 1), (2.0, 2)]
+    packets = tables(decisions = decisions, packets = [(0.5, 1000), (1.5, 1000), (2.5, 1000), (3.5, 1000)])
+    binned = tables(decisions = decisions, packets = [(0.0, 2000), (2.0, 2000)], bins = 2.0)
+    assert kpis(binned)["avgQuality"] == pytest.approx((1 * 2 + 2 * 2) / 4)
+    assert kpis(packets)["avgQuality"] == pytest.approx((1 * 2 + 2 * 1.5) / 3.5)
@@ -0,0 +1,36 @@
+import numpy as np
+
+import dash_visualization as dv
+
+def test_binner_emits_closed_seconds_only():
+    binner = dv.SecondBinner()
+    seconds, sums = binner.push(np.array([0.1, 0.5, 1.2]), np.array([1.0, 2.0, 4.0]))
+    assert list(seconds) == [0] and list(sums) == [3.0]
+    #a late row of the open second is merged into it
+    seconds, sums = binner.push(np.array([1.9, 2.1]), np.array([8.0, 16.0]))
+    assert list(seconds) == [1] and list(sums) == [12.0]
+
+def test_flush_closes_the_last_second():
+    binner = dv.SecondBinner()
+    binner.push(np.array([0.1, 1.2, 1.5]), np.array([1.0, 2.0, 4.0]))
+    seconds, sums = binner.flush()
+    assert list(seconds) == [1] and list(sums) == [6.0]
+    assert len(binner.flush()[0]) == 0
+    #rows that arrive after the run stopped do not add seconds
+    assert len(binner.push(np.array([1.7, 2.5]), np.array([1.0, 1.0]))[0]) == 0
+    assert len(binner.flush()[0]) == 0
+    assert len(dv.SecondBinner().flush()[0]) == 0
+
+def test_finish_live_run_appends_the_last_second(tmp_path):
+    log = tmp_path / "sim0_cl0_panda_output.txt"
+    rows = ["Time_Now;Segment_Index;Download_Request_Sent;Download_Start;Download_End;Segment_Size;Download_OK;Quality_Level;Rep_Level;Case;DelayCase;Buffer_Level;Bytes_Received;Buffer_Underrun"]
+    rows += [str(t) + ";;;;;;;;;;;;1000;" for t in [0.2, 0.7, 1.1, 1.6]]
+    log.write_text("\n".join(rows) + "\n")
+    path = str(tmp_path)
+    run = dv.new_load_live_data(path, "sim0")
+    tp = run["clients"][log.name]["tp"]
+    assert list(tp.view("Time_Now")) == [0]
+    dv.finish_live_run(path, "sim0")
+    assert list(tp.view("Time_Now")) == [0, 1]
+    np.testing.assert_allclose(tp.view("Bytes_Received"), [16.0, 16.0])
+    run["watcher"].stop()